@@ -0,0 +1,203 @@
+"""
+여러 계정 / 리전 / 서비스에 걸친 Prowler finding 집계 엔진
+
+리포트를 한 번씩만 스트리밍으로 읽으면서 group-by 키별 PASS / FAIL 건수와 통과율을
+계산합니다. 그룹별 실패 check 상위 N개는 Space-Saving, 전체 실패 check 상위 N개는
+Count-Min Sketch + 후보 집합으로 추적하고, 그룹 수는 max_tracked_groups 로 제한하므로
+(넘치는 그룹은 '(기타)' 그룹으로 합침) 리포트 수가 늘어도 메모리 사용량이 일정합니다.
+"""
+
+import hashlib
+import heapq
+from array import array
+
+from follow import ReportFollower
+from parser import finding_dimensions
+
+DIMENSIONS = ("account", "region", "service", "check", "severity", "status", "report")
+
+# 개별로 추적하는 최대 그룹 수 (그 뒤에 처음 나온 그룹은 OTHER_GROUP 으로 합침)
+DEFAULT_MAX_TRACKED_GROUPS = 10000
+OTHER_GROUP = "(기타)"
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitter 추적 (Metwally et al.)
+    capacity 개의 카운터만 유지하며, 추정값은 실제값보다 최대 error 만큼 클 수 있습니다.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, item, count: int = 1):
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            # 가장 작은 카운터를 새 항목으로 교체
+            victim = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(victim)
+            self.errors.pop(victim)
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+
+    def top(self, n: int) -> list:
+        """[(item, 추정 건수, 최대 오차)] 내림차순"""
+        ranked = heapq.nlargest(n, self.counts.items(), key=lambda kv: kv[1])
+        return [(item, count, self.errors[item]) for item, count in ranked]
+
+
+class CountMinSketch:
+    """고정 크기 Count-Min Sketch - 추정값은 실제값 이상"""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.tables = [array("l", [0]) * width for _ in range(depth)]
+
+    def _indexes(self, item):
+        digest = hashlib.blake2b(repr(item).encode("utf-8"), digest_size=4 * self.depth).digest()
+        for row in range(self.depth):
+            yield row, int.from_bytes(digest[row * 4:row * 4 + 4], "little") % self.width
+
+    def add(self, item, count: int = 1) -> int:
+        """항목 추가 후 추정 건수 반환"""
+        estimate = None
+        for row, index in self._indexes(item):
+            self.tables[row][index] += count
+            value = self.tables[row][index]
+            estimate = value if estimate is None else min(estimate, value)
+        return estimate
+
+    def estimate(self, item) -> int:
+        return min(self.tables[row][index] for row, index in self._indexes(item))
+
+
+class HeavyHitters:
+    """Count-Min Sketch 추정값 기준 상위 후보를 capacity 개까지 유지"""
+
+    def __init__(self, capacity: int, width: int = 2048, depth: int = 4):
+        self.capacity = capacity
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = {}
+
+    def add(self, item, count: int = 1):
+        estimate = self.sketch.add(item, count)
+        if item in self.candidates or len(self.candidates) < self.capacity:
+            self.candidates[item] = estimate
+            return
+        smallest = min(self.candidates, key=self.candidates.get)
+        if estimate > self.candidates[smallest]:
+            del self.candidates[smallest]
+            self.candidates[item] = estimate
+
+    def top(self, n: int) -> list:
+        """[(item, 추정 건수)] 내림차순"""
+        return heapq.nlargest(n, ((item, self.sketch.estimate(item)) for item in self.candidates),
+                              key=lambda kv: kv[1])
+
+
+class GroupStats:
+    """그룹 하나의 건수와 실패 check heavy hitter"""
+
+    __slots__ = ("total", "passed", "failed", "severity_fail", "failing_checks")
+
+    def __init__(self, top_capacity: int):
+        self.total = 0
+        self.passed = 0
+        self.failed = 0
+        self.severity_fail = {}
+        self.failing_checks = SpaceSaving(top_capacity)
+
+    @property
+    def pass_rate(self) -> float:
+        checked = self.passed + self.failed
+        return self.passed / checked * 100 if checked else 0.0
+
+
+class FindingAggregator:
+    """
+    multi-key group-by 집계
+    :param group_by: DIMENSIONS 중 그룹 키 목록 (예: ("account", "region"))
+    :param top_n: 그룹별 / 전체 실패 check 상위 개수
+    :param max_tracked_groups: 개별로 추적하는 최대 그룹 수 (초과분은 '(기타)' 그룹으로 합침)
+    """
+
+    def __init__(self, group_by, top_n: int = 20, max_tracked_groups: int = DEFAULT_MAX_TRACKED_GROUPS):
+        unknown = [d for d in group_by if d not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"알 수 없는 그룹 키: {', '.join(unknown)} (가능한 값: {', '.join(DIMENSIONS)})")
+        self.group_by = tuple(group_by)
+        self.top_n = top_n
+        # Space-Saving 은 capacity 가 클수록 상위 N개 추정이 정확해짐
+        self.top_capacity = max(top_n * 4, 16)
+        self.max_tracked_groups = max_tracked_groups
+        self.other_key = (OTHER_GROUP,) * len(self.group_by)
+        self.groups = {}
+        self.other_findings = 0
+        self.global_failing = HeavyHitters(self.top_capacity)
+        self.findings = 0
+        self.reports = 0
+        self.parse_errors = 0
+        # 일부만 집계된 리포트 [(label, 사유)]
+        self.partial_reports = []
+
+    def add(self, finding: dict, report: str = ""):
+        dims = finding_dimensions(finding)
+        dims["report"] = report
+        key = tuple(dims[d] or "(없음)" for d in self.group_by)
+        stats = self.groups.get(key)
+        if stats is None:
+            if len(self.groups) >= self.max_tracked_groups and key != self.other_key:
+                key = self.other_key
+                stats = self.groups.get(key)
+            if stats is None:
+                stats = self.groups[key] = GroupStats(self.top_capacity)
+        if key == self.other_key:
+            self.other_findings += 1
+
+        self.findings += 1
+        stats.total += 1
+        if dims["status"] == "PASS":
+            stats.passed += 1
+        elif dims["status"] == "FAIL":
+            stats.failed += 1
+            severity = dims["severity"] or "(없음)"
+            stats.severity_fail[severity] = stats.severity_fail.get(severity, 0) + 1
+            check = dims["check"] or "(없음)"
+            stats.failing_checks.add(check)
+            self.global_failing.add(check)
+
+    def add_report(self, file_path, label: str = None) -> dict:
+        """
+        다 쓰인 리포트 하나를 블록 단위로 스트리밍하면서 집계
+        :param label: report 그룹 키로 쓸 이름 (기본값: 파일 경로)
+        """
+        label = label or str(file_path)
+        follower = ReportFollower(file_path, on_finding=lambda f: self.add(f, label))
+        status = follower.poll(final=True)
+        self.reports += 1
+        self.parse_errors += status["parse_errors"]
+        if status["format"] == "unknown":
+            self.partial_reports.append((label, "CSV / JSON 형식이 아님"))
+        elif status["parse_errors"]:
+            self.partial_reports.append((label, f"파싱 오류 {status['parse_errors']}개"))
+        return status
+
+    def totals(self) -> GroupStats:
+        total = GroupStats(1)
+        for stats in self.groups.values():
+            total.total += stats.total
+            total.passed += stats.passed
+            total.failed += stats.failed
+        return total
+
+    def ranked_groups(self, limit: int = None) -> list:
+        """실패 건수 내림차순 [(group key, GroupStats)]"""
+        ranked = sorted(self.groups.items(), key=lambda kv: (-kv[1].failed, kv[0]))
+        return ranked if limit is None else ranked[:limit]
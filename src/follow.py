@@ -0,0 +1,303 @@
+"""
+실행 중인 Prowler 스캔이 작성 중인 리포트를 tail-follow 방식으로 읽는 모듈
+
+리포트별로 바이트 오프셋을 기록해 두고, 새로 추가된 바이트 중 완결된 레코드
+(CSV 행, JSON-lines 행, JSON 배열 원소)만 파싱해서 누적 카운트를 갱신합니다.
+"""
+
+import codecs
+import csv
+import io
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+from ingest import SNIFF_SIZE, detect_encoding
+from parser import KEYWORD_LIST, classify_finding
+
+# 한 번에 읽어 들일 최대 바이트 수 (큰 파일의 첫 poll 에서도 메모리 사용량을 제한)
+READ_BLOCK_SIZE = 4 * 1024 * 1024
+
+FORMAT_CSV = "csv"
+FORMAT_JSON_ARRAY = "json-array"
+FORMAT_JSON_LINES = "json-lines"
+FORMAT_UNKNOWN = "unknown"
+
+# 줄바꿈 / 따옴표 / 괄호를 바이트로 찾을 수 없어 UTF-8 로 변환해서 파싱하는 인코딩
+WIDE_ENCODINGS = ("utf-16", "utf-32")
+
+
+class ReportFollower:
+    """작성 중인 리포트 하나에 대한 follow 상태"""
+
+    def __init__(self, file_path, on_finding=None):
+        """
+        :param file_path: 리포트 파일 경로
+        :param on_finding: 완결 레코드마다 호출할 함수 (집계 엔진에서 사용)
+        """
+        self.path = Path(file_path)
+        self.on_finding = on_finding
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """오프셋과 누적 카운트를 초기화"""
+        self.offset = 0
+        self.format = None
+        self.header = None
+        self.delimiter = ","
+        self.encoding = "utf-8"
+        self.array_opened = False
+        self.array_closed = False
+        self.record_count = 0
+        self.error_count = 0
+        self.keyword_counts = {k: 0 for k in KEYWORD_LIST}
+
+    def poll(self, final: bool = False) -> dict:
+        """
+        마지막 오프셋 이후 추가된 완결 레코드만 파싱
+        :param final: 다 쓰인 파일을 한 번에 읽는 경우 (집계 엔진) - 끝에 남은 데이터를
+            작성 중인 레코드로 보고 기다리지 않고, 마저 파싱하거나 파싱 오류로 셈
+        :return: 이번 poll 결과와 누적 상태를 담은 dict
+        """
+        stat = self.path.stat()
+        # 파일이 잘렸거나 새로 쓰이기 시작했으면 처음부터 다시 읽기
+        if stat.st_size < self.offset:
+            self.reset()
+
+        start_offset = self.offset
+        start_records = self.record_count
+        carry = b""
+        with open(self.path, "rb") as f:
+            if self.offset == 0:
+                # 인코딩은 파일 앞부분으로 판단하고 BOM 은 건너뜀
+                self.encoding, self.offset = detect_encoding(f.read(SNIFF_SIZE))
+            f.seek(self.offset)
+            # poll 도중 추가되는 바이트는 다음 poll 에서 읽음 (file_size / pending_bytes 와 일치)
+            while self.format != FORMAT_UNKNOWN:
+                block = f.read(min(READ_BLOCK_SIZE, stat.st_size - f.tell()))
+                if not block:
+                    break
+                buffer = carry + block
+                data = self._transcode(buffer) if self.wide else buffer
+                if self.format is None:
+                    self._detect_format(data)
+                    if self.format is None:
+                        carry = buffer
+                        continue
+                    if self.format == FORMAT_UNKNOWN:
+                        break
+                consumed = self._consume(data)
+                if self.wide:
+                    consumed = self._source_length(data[:consumed])
+                self.offset += consumed
+                carry = buffer[consumed:]
+
+        if final and self.format != FORMAT_UNKNOWN and self.offset < stat.st_size:
+            self._finish(carry)
+
+        return {
+            "file_path": str(self.path),
+            "format": self.format or FORMAT_UNKNOWN,
+            "encoding": self.encoding,
+            "offset": self.offset,
+            "file_size": stat.st_size,
+            "pending_bytes": stat.st_size - self.offset,
+            "bytes_read": self.offset - start_offset,
+            "new_records": self.record_count - start_records,
+            "total_records": self.record_count,
+            "parse_errors": self.error_count,
+            "complete": self.array_closed,
+            "keyword_counts": dict(self.keyword_counts),
+        }
+
+    @property
+    def wide(self) -> bool:
+        """ASCII 와 호환되지 않는 인코딩 (UTF-16 / UTF-32) 여부 - UTF-8 로 변환해서 파싱"""
+        return self.encoding.startswith(WIDE_ENCODINGS)
+
+    def _transcode(self, buffer: bytes) -> bytes:
+        """UTF-16 / UTF-32 버퍼를 UTF-8 로 변환 (끝에서 잘린 문자는 다음 블록으로 넘김)"""
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="surrogatepass")
+        return decoder.decode(buffer, final=False).encode("utf-8", errors="surrogatepass")
+
+    def _source_length(self, data: bytes) -> int:
+        """변환된 UTF-8 바이트가 원본 파일에서 차지하는 바이트 수"""
+        return len(data.decode("utf-8", errors="surrogatepass").encode(self.encoding, errors="surrogatepass"))
+
+    def _finish(self, carry: bytes):
+        """final poll - 파일 끝에 남은 바이트를 마저 파싱하고 소비한 것으로 처리"""
+        data = carry.decode(self.encoding, errors="replace").encode("utf-8") if self.wide else carry
+        if self.format is None:
+            self._detect_format(data + b"\n")
+        if data.strip() and self.format not in (None, FORMAT_UNKNOWN):
+            # 마지막 줄에 개행이 없어도 완결된 레코드로 파싱
+            data += b"\n"
+            consumed = self._consume(data)
+            if data[consumed:].strip():
+                self.error_count += 1
+        self.offset += len(carry)
+
+    def _detect_format(self, data: bytes):
+        """첫 번째 블록으로 리포트 형식 판단"""
+        head = data.lstrip()
+        if self.path.suffix.lower() == ".csv":
+            # 헤더 행이 완결되어야 구분자를 판단할 수 있음
+            if b"\n" in data:
+                self.format = FORMAT_CSV
+        elif head.startswith(b"["):
+            self.format = FORMAT_JSON_ARRAY
+        elif head.startswith(b"{"):
+            self.format = FORMAT_JSON_LINES
+        elif head:
+            # JSON 도 CSV 도 아닌 파일 - 더 읽지 않음
+            self.format = FORMAT_UNKNOWN
+
+    def _count(self, finding):
+        if self.on_finding is not None:
+            self.on_finding(finding)
+        status, severity = classify_finding(finding)
+        self.record_count += 1
+        if status in self.keyword_counts:
+            self.keyword_counts[status] += 1
+        if severity in self.keyword_counts:
+            self.keyword_counts[severity] += 1
+
+    def _consume(self, buffer: bytes) -> int:
+        """버퍼에서 완결된 레코드를 파싱하고 소비한 바이트 수를 반환"""
+        if self.format == FORMAT_CSV:
+            return self._consume_csv(buffer)
+        return self._consume_json(buffer)
+
+    def _consume_csv(self, buffer: bytes) -> int:
+        encoding = "utf-8" if self.wide else self.encoding
+        consumed = 0
+        record_start = 0
+        pos = 0
+        while True:
+            newline = buffer.find(b"\n", pos)
+            if newline < 0:
+                break
+            pos = newline + 1
+            record = buffer[record_start:pos]
+            # 따옴표 안의 줄바꿈이면 다음 줄까지 이어서 하나의 레코드로 처리
+            if record.count(b'"') % 2:
+                continue
+            record_start = pos
+            consumed = pos
+            line = record.decode(encoding, errors="replace").lstrip("\ufeff").rstrip("\r\n")
+            if not line.strip():
+                continue
+            if self.header is None:
+                self.delimiter = ";" if line.count(";") > line.count(",") else ","
+                self.header = next(csv.reader([line], delimiter=self.delimiter))
+                continue
+            try:
+                row = next(csv.reader(io.StringIO(line), delimiter=self.delimiter))
+            except (csv.Error, StopIteration):
+                self.error_count += 1
+                continue
+            self._count(dict(zip(self.header, row)))
+        return consumed
+
+    def _consume_json(self, buffer: bytes) -> int:
+        """JSON 배열 원소 또는 JSON-lines 객체 중 완결된 것만 파싱"""
+        # surrogateescape 로 디코딩하면 문자 위치를 바이트 오프셋으로 정확히 되돌릴 수 있음
+        text = buffer.decode("utf-8", errors="surrogateescape")
+        decoder = json.JSONDecoder()
+        pos = 0
+        consumed_chars = 0
+        length = len(text)
+        while pos < length and not self.array_closed:
+            ch = text[pos]
+            if ch.isspace() or ch == "\ufeff" or (ch == "," and self.format == FORMAT_JSON_ARRAY):
+                pos += 1
+                consumed_chars = pos
+                continue
+            if self.format == FORMAT_JSON_ARRAY:
+                if ch == "[" and not self.array_opened:
+                    self.array_opened = True
+                    pos += 1
+                    consumed_chars = pos
+                    continue
+                if ch == "]":
+                    self.array_closed = True
+                    consumed_chars = pos + 1
+                    break
+            try:
+                finding, end = decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                end = self._record_end(text, pos)
+                if end < 0:
+                    # 아직 끝까지 쓰이지 않은 레코드 - 다음 poll 에서 다시 시도
+                    break
+                # 다음 구분자까지 이미 쓰여 있으면 잘못된 레코드 - 오류로 세고 건너뜀
+                self.error_count += 1
+                pos = end
+                consumed_chars = pos
+                continue
+            self._count(finding)
+            pos = end
+            consumed_chars = pos
+        return len(text[:consumed_chars].encode("utf-8", errors="surrogateescape"))
+
+    def _record_end(self, text: str, pos: int) -> int:
+        """
+        pos 에서 시작하는 레코드 다음의 구분자 위치 (문자열 안의 괄호/쉼표는 무시)
+        배열은 깊이 0 의 ',' 또는 ']', JSON-lines 는 깊이 0 의 줄바꿈이나 닫는 괄호 직후
+        :return: 버퍼 안에 구분자가 아직 없으면 -1
+        """
+        depth = 0
+        in_string = escaped = False
+        for i in range(pos, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch in "{[":
+                depth += 1
+            elif ch in "}]":
+                if depth == 0:
+                    # 배열을 닫는 ']' 는 호출한 쪽에서 처리, 짝이 없는 괄호는 레코드에 포함
+                    return i if ch == "]" and self.format == FORMAT_JSON_ARRAY else i + 1
+                depth -= 1
+                if depth == 0 and self.format == FORMAT_JSON_LINES:
+                    return i + 1
+            elif depth == 0 and (ch == "\n" or (ch == "," and self.format == FORMAT_JSON_ARRAY)):
+                return i
+        return -1
+
+
+class ReportFollowRegistry:
+    """리포트 경로별 ReportFollower 관리 (여러 세션에서 동시에 호출해도 안전)"""
+
+    def __init__(self):
+        self._followers = {}
+        self._lock = threading.Lock()
+
+    def poll(self, file_path, reset: bool = False) -> dict:
+        key = os.path.abspath(file_path)
+        with self._lock:
+            follower = self._followers.get(key)
+            if follower is None:
+                follower = self._followers[key] = ReportFollower(key)
+        with follower.lock:
+            if reset:
+                follower.reset()
+            return follower.poll()
+
+    def approximate_bytes(self) -> int:
+        """follow 상태가 차지하는 대략적인 메모리 (메모리 예산 집계용)"""
+        with self._lock:
+            followers = list(self._followers.values())
+        return sum(sys.getsizeof(f) + sys.getsizeof(f.keyword_counts)
+                   + sum(sys.getsizeof(col) for col in f.header or ())
+                   for f in followers)
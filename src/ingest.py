@@ -0,0 +1,213 @@
+"""
+바이트 단위 리포트 수집 모듈
+
+파일 전체를 str 로 디코딩하지 않고 mmap 위에서 바이트 단위로 작업합니다.
+첫 블록으로 BOM 과 인코딩(UTF-8 / UTF-16 / UTF-32 / cp949)을 판별하고,
+ASCII 호환 인코딩이면 상태/심각도 토큰을 바이트 그대로 셉니다.
+실제로 반환하는 미리보기, 샘플 행 등의 구간만 디코딩합니다.
+"""
+
+import codecs
+import mmap
+import re
+from pathlib import Path
+
+# 인코딩 판별에 사용할 첫 블록 크기
+SNIFF_SIZE = 64 * 1024
+
+# 줄 수를 셀 때 한 번에 복사하는 블록 크기
+COUNT_BLOCK_SIZE = 4 * 1024 * 1024
+
+# 긴 BOM 부터 검사 (UTF-32 LE BOM 은 UTF-16 LE BOM 으로 시작함)
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+
+# 바이트 그대로 ASCII 토큰을 검색해도 오탐이 없는 인코딩
+# (cp949 는 두 번째 바이트가 ASCII 영문자 범위와 겹치므로 제외)
+_BYTE_SEARCHABLE = {"utf-8", "ascii", "latin-1"}
+
+_token_patterns = {}
+
+# 공백이 아닌 첫 바이트부터 줄 끝까지 - 비어 있지 않은 줄마다 한 번씩 매칭
+_NON_BLANK_LINE = re.compile(rb"[^\s][^\n]*")
+
+
+def detect_encoding(head: bytes) -> tuple:
+    """
+    첫 블록으로 인코딩 판별
+    :param head: 파일 앞부분 바이트
+    :return: (encoding, bom_length)
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+
+    # 블록 끝에서 잘린 멀티바이트 문자는 무시하고 검사
+    for encoding in ("utf-8", "cp949"):
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return encoding, 0
+        except UnicodeDecodeError:
+            continue
+    return "latin-1", 0
+
+
+def _token_pattern(token: str, ignore_case: bool):
+    key = (token, ignore_case)
+    pattern = _token_patterns.get(key)
+    if pattern is None:
+        flags = re.IGNORECASE if ignore_case else 0
+        pattern = _token_patterns[key] = (
+            re.compile(rb"\b" + re.escape(token.encode("ascii")) + rb"\b", flags),
+            re.compile(r"\b" + re.escape(token) + r"\b", flags),
+        )
+    return pattern
+
+
+class ReportBuffer:
+    """리포트 파일의 바이트 뷰 (with 문으로 사용)"""
+
+    def __init__(self, file_path):
+        self.path = Path(file_path)
+        self._file = None
+        self._mmap = None
+        # mmap 또는 빈 파일일 때의 b"" - 둘 다 find / 슬라이싱 / re 검색을 지원
+        self.data = b""
+        self.size = 0
+        self.encoding = "utf-8"
+        self.bom_length = 0
+        self._text = None
+
+    def __enter__(self):
+        self._file = open(self.path, "rb")
+        self.size = self.path.stat().st_size
+        if self.size > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.data = self._mmap
+        self.encoding, self.bom_length = detect_encoding(self.data[:SNIFF_SIZE])
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._text = None
+        self.data = b""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def byte_searchable(self) -> bool:
+        """ASCII 토큰을 디코딩 없이 바이트로 검색할 수 있는지 여부"""
+        return self.encoding in _BYTE_SEARCHABLE
+
+    @property
+    def body_length(self) -> int:
+        """BOM 을 제외한 본문 바이트 수"""
+        return self.size - self.bom_length
+
+    def text(self) -> str:
+        """본문 전체 디코딩 (HTML 파싱처럼 전체 문자열이 꼭 필요한 경우에만 사용)"""
+        if self._text is None:
+            self._text = str(self.data[self.bom_length:], self.encoding, errors="replace")
+        return self._text
+
+    def json_source(self):
+        """json.loads 에 넘길 본문 - UTF 계열은 bytes 그대로, 그 외는 디코딩"""
+        if self.encoding.startswith("utf"):
+            return self.data[self.bom_length:]
+        return self.text()
+
+    def decode(self, start: int = 0, length: int = None) -> str:
+        """
+        본문의 일부 구간만 디코딩 (구간 끝에서 잘린 멀티바이트 문자는 버림)
+        :param start: 본문 기준 시작 바이트 위치
+        :param length: 디코딩할 최대 바이트 수 (None 이면 끝까지)
+        """
+        end = self.body_length if length is None else min(self.body_length, start + length)
+        chunk = self.data[self.bom_length + start:self.bom_length + end]
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        return decoder.decode(chunk, final=end >= self.body_length)
+
+    def preview(self, max_chars: int) -> str:
+        """앞부분 max_chars 글자만 디코딩 (문자당 최대 4바이트 기준으로 읽음)"""
+        return self.decode(0, max_chars * 4)[:max_chars]
+
+    def count_keywords(self, keywords, ignore_case: bool = True) -> dict:
+        """
+        단어 경계 기준 토큰 수 집계
+        ASCII 호환 인코딩이면 mmap 위에서 바로 검색하고, 아니면 디코딩 후 검색합니다.
+        """
+        counts = {}
+        for keyword in keywords:
+            byte_pattern, text_pattern = _token_pattern(keyword, ignore_case)
+            if self.byte_searchable:
+                matches = byte_pattern.finditer(self.data, self.bom_length)
+            else:
+                matches = text_pattern.finditer(self.text())
+            counts[keyword] = sum(1 for _ in matches)
+        return counts
+
+    def count_lines(self, skip_blank: bool = False) -> int:
+        """
+        줄 수 (마지막 줄이 개행으로 끝나지 않아도 한 줄로 셈)
+        :param skip_blank: True 이면 공백만 있는 줄은 세지 않음
+        """
+        if self.body_length <= 0:
+            return 0
+        if not self.byte_searchable and self.encoding != "cp949":
+            lines = self.text().splitlines()
+            return sum(1 for line in lines if line.strip()) if skip_blank else len(lines)
+        if skip_blank:
+            # cp949 의 두 번째 바이트는 공백 / 개행 범위와 겹치지 않음
+            return sum(1 for _ in _NON_BLANK_LINE.finditer(self.data, self.bom_length))
+        lines = 0
+        for pos in range(self.bom_length, self.size, COUNT_BLOCK_SIZE):
+            lines += self.data[pos:pos + COUNT_BLOCK_SIZE].count(b"\n")
+        return lines if self.data[self.size - 1:self.size] == b"\n" else lines + 1
+
+    def iter_lines(self, limit: int = None):
+        """
+        앞에서부터 비어 있지 않은 줄을 디코딩해서 반환
+        :param limit: 최대 줄 수
+        """
+        if not self.byte_searchable and self.encoding != "cp949":
+            yield from _take((line.strip() for line in self.text().splitlines()), limit)
+            return
+
+        pos = self.bom_length
+        emitted = 0
+        while pos < self.size and (limit is None or emitted < limit):
+            end = self.data.find(b"\n", pos)
+            if end < 0:
+                end = self.size
+            line = str(self.data[pos:end], self.encoding, errors="replace").strip()
+            pos = end + 1
+            if line:
+                emitted += 1
+                yield line
+
+
+def _take(lines, limit):
+    emitted = 0
+    for line in lines:
+        if not line:
+            continue
+        if limit is not None and emitted >= limit:
+            return
+        emitted += 1
+        yield line
+
+
+def open_report(file_path) -> ReportBuffer:
+    """리포트 파일을 바이트 뷰로 열기"""
+    return ReportBuffer(file_path)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+HTTP/SSE 모드로 실행 중인 Prowler MCP 서버용 로컬 부하 생성기
+
+여러 어시스턴트 세션을 흉내 내서 목록 / 분석 / 요약 / 내용 조회 tool 호출을
+가중치에 따라 섞어 보내고, 처리량과 tool 별 p50 / p95 / p99 지연 시간을 출력합니다.
+
+사용 예)
+    python src/prowler_mcp_server.py --transport http --port 8000
+    python src/loadgen.py --url http://127.0.0.1:8000/mcp/ --sessions 16 --duration 30
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from fastmcp import Client
+
+BASEDIR = Path(__file__).resolve().parent.parent
+
+# 실제 사용 패턴을 반영한 기본 tool 호출 비율
+DEFAULT_MIX = "list=30,latest=10,analyze=30,summary=20,content=10"
+
+SKIP_FILES = {".DS_Store"}
+
+
+def parse_mix(mix: str) -> dict:
+    """'list=30,analyze=30' 형식의 호출 비율 파싱"""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in TOOL_CALLS:
+            raise argparse.ArgumentTypeError(
+                f"알 수 없는 호출 종류: {name} (가능한 값: {', '.join(TOOL_CALLS)})"
+            )
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def _list_call(files):
+    return "get_prowler_reports_list", {}
+
+
+def _latest_call(files):
+    return "get_latest_prowler_file", {}
+
+
+def _analyze_call(files):
+    return "analyze_prowler_results", {"file_path": random.choice(files)}
+
+
+def _summary_call(files):
+    return "get_security_summary", {"file_path": random.choice(files)}
+
+
+def _content_call(files):
+    return "get_file_content", {"file_path": random.choice(files)}
+
+
+TOOL_CALLS = {
+    "list": _list_call,
+    "latest": _latest_call,
+    "analyze": _analyze_call,
+    "summary": _summary_call,
+    "content": _content_call,
+}
+
+# 파일 경로가 필요한 호출
+FILE_CALLS = {"analyze", "summary", "content"}
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """nearest-rank 방식 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadStats:
+    """호출 종류별 지연 시간과 오류 수 기록"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, kind: str, elapsed: float, ok: bool):
+        self.latencies[kind].append(elapsed)
+        if not ok:
+            self.errors[kind] += 1
+
+    def report(self, wall_time: float) -> str:
+        all_latencies = sorted(t for values in self.latencies.values() for t in values)
+        total = len(all_latencies)
+        total_errors = sum(self.errors.values())
+        lines = [
+            "",
+            "# 📈 부하 테스트 결과",
+            f"• 총 요청 수: {total:,}개 (오류 {total_errors:,}개)",
+            f"• 소요 시간: {wall_time:.2f}초",
+            f"• 처리량: {total / wall_time if wall_time > 0 else 0:.1f} req/s",
+            "",
+            f"{'호출':<10}{'요청':>8}{'오류':>6}{'평균(ms)':>11}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}",
+        ]
+        rows = sorted(self.latencies.items()) + [("ALL", all_latencies)]
+        for kind, values in rows:
+            values = sorted(values)
+            errors = total_errors if kind == "ALL" else self.errors[kind]
+            mean = sum(values) / len(values) if values else 0.0
+            lines.append(
+                f"{kind:<10}{len(values):>8}{errors:>6}{mean * 1000:>11.1f}"
+                f"{percentile(values, 50) * 1000:>10.1f}"
+                f"{percentile(values, 95) * 1000:>10.1f}"
+                f"{percentile(values, 99) * 1000:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+async def run_session(url: str, kinds: list, weights: list, files: list,
+                      deadline: float, remaining: list, stats: LoadStats, call_timeout: float):
+    """세션 하나 - 마감 시간이나 총 요청 수에 도달할 때까지 tool 호출 반복"""
+    async with Client(url) as client:
+        while time.perf_counter() < deadline:
+            if remaining is not None:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            kind = random.choices(kinds, weights=weights)[0]
+            name, arguments = TOOL_CALLS[kind](files)
+            started = time.perf_counter()
+            try:
+                result = await client.call_tool(name, arguments, timeout=call_timeout,
+                                                raise_on_error=False)
+                ok = not result.is_error
+            except Exception:
+                ok = False
+            stats.record(kind, time.perf_counter() - started, ok)
+
+
+async def run_load(args) -> LoadStats:
+    weights = dict(args.mix)
+    files = [str(f) for f in sorted(Path(args.reports_dir).iterdir())
+             if f.is_file() and f.name not in SKIP_FILES]
+    if not files:
+        # 파일이 필요한 호출은 제외
+        weights = {k: w for k, w in weights.items() if k not in FILE_CALLS}
+        print(f"⚠️ 리포트 파일이 없어 목록 조회 호출만 보냅니다: {args.reports_dir}")
+    if not weights:
+        raise SystemExit("❌ 보낼 수 있는 호출이 없습니다.")
+
+    stats = LoadStats()
+    remaining = [args.requests] if args.requests else None
+    deadline = time.perf_counter() + (args.duration if args.duration > 0 else float("inf"))
+    sessions = [
+        run_session(args.url, list(weights), list(weights.values()), files,
+                    deadline, remaining, stats, args.call_timeout)
+        for _ in range(args.sessions)
+    ]
+    await asyncio.gather(*sessions)
+    return stats
+
+
+def parse_args():
+    """명령줄 인자 파싱"""
+    p = argparse.ArgumentParser(description="Prowler MCP 서버 부하 생성기")
+    p.add_argument("--url", type=str, default="http://127.0.0.1:8000/mcp/",
+                   help="MCP 서버 URL (sse 모드는 .../sse/) (기본값: http://127.0.0.1:8000/mcp/)")
+    p.add_argument("--sessions", type=int, default=8,
+                   help="동시에 접속하는 세션 수 (기본값: 8)")
+    p.add_argument("--duration", type=float, default=30.0,
+                   help="테스트 시간(초), 0 이면 --requests 로만 종료 (기본값: 30)")
+    p.add_argument("--requests", type=int, default=0,
+                   help="전체 요청 수 제한, 0 이면 무제한 (기본값: 0)")
+    p.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                   help=f"호출 종류별 비율 (기본값: {DEFAULT_MIX})")
+    p.add_argument("--reports-dir", type=str, default=str(BASEDIR.joinpath("prowler-reports")),
+                   help="분석/요약/내용 조회에 사용할 리포트 디렉토리 (기본값: ./prowler-reports)")
+    p.add_argument("--call-timeout", type=float, default=120.0,
+                   help="클라이언트 측 호출 제한 시간(초) (기본값: 120)")
+    p.add_argument("--seed", type=int, default=None, help="호출 순서 재현용 난수 시드")
+    args = p.parse_args()
+    if args.duration <= 0 and args.requests <= 0:
+        p.error("--duration 과 --requests 중 하나는 0보다 커야 합니다.")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+    print(f"🚀 부하 테스트 시작: {args.url} (세션 {args.sessions}개)")
+    print("   호출 비율: " + ", ".join(f"{k}={w:g}" for k, w in args.mix.items()))
+    started = time.perf_counter()
+    stats = asyncio.run(run_load(args))
+    print(stats.report(time.perf_counter() - started))
@@ -0,0 +1,410 @@
+"""
+서버 프로세스 전체의 메모리 예산 관리 모듈
+
+캐시/인덱스/파싱 버퍼가 사용하는 바이트를 저장소별로 집계하고, 예산(바이트 한도와
+선택적인 RSS 한도)을 넘으면 재생성 비용을 반영한 LRU 방식(GreedyDual-Size)으로 항목을
+내보냅니다. 내보낸 항목은 디스크에 spill 해 두었다가 다시 요청되면 파싱 없이 읽어 옵니다.
+"""
+
+import atexit
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_BUDGET_MB = 512
+
+# spill 디렉토리 최대 크기 (메모리 예산 대비 배수)
+SPILL_LIMIT_RATIO = 4
+
+# 재생성 비용을 모를 때 사용하는 기본값 (초)
+DEFAULT_REBUILD_COST = 0.001
+
+# RSS 한도를 넘었을 때 집계된 사용량을 이 비율까지 줄임
+# (파이썬 객체를 내보내도 RSS 는 바로 줄지 않으므로 RSS 자체를 목표로 반복하지 않음)
+RSS_EVICTION_RATIO = 0.8
+
+# RSS 를 다시 확인하기까지의 최소 간격 (초)
+RSS_CHECK_INTERVAL = 5.0
+
+
+def estimate_size(obj, _seen=None) -> int:
+    """dict / list / str 등으로 이루어진 객체의 대략적인 메모리 사용량 (바이트)"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    return size
+
+
+def current_rss() -> int:
+    """현재 프로세스 RSS (바이트), 확인할 수 없는 플랫폼에서는 None"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class _Entry:
+    __slots__ = ("value", "size", "cost", "priority")
+
+    def __init__(self, value, size, cost, priority):
+        self.value = value
+        self.size = size
+        self.cost = cost
+        self.priority = priority
+
+
+class CacheStore:
+    """MemoryGovernor 가 관리하는 캐시 하나 (get_or_build 로 사용)"""
+
+    def __init__(self, governor, name: str, spill: bool = True):
+        self.governor = governor
+        self.name = name
+        self.spill = spill
+        self._entries = {}
+        self._spilled = {}
+        self.counters = defaultdict(int)
+
+    @property
+    def bytes_used(self) -> int:
+        return sum(entry.size for entry in self._entries.values())
+
+    @property
+    def spilled_bytes(self) -> int:
+        return sum(size for _, size, _ in self._spilled.values())
+
+    def get_or_build(self, key, build, size_of=estimate_size):
+        """
+        캐시된 값을 반환하고, 없으면 build() 로 만들어서 저장
+        :param key: 캐시 키 (파일 경로, mtime, 크기 등 버전 정보를 포함해야 함)
+        :param build: 인자 없는 생성 함수 - 실행 시간이 재생성 비용으로 기록됨
+        :param size_of: 값의 메모리 사용량 추정 함수
+        """
+        governor = self.governor
+        with governor.lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.counters["hits"] += 1
+                governor.touch(entry)
+                return entry.value
+            spilled = self._spilled.pop(key, None)
+
+        if spilled is not None:
+            value = self._load_spilled(spilled)
+            if value is not None:
+                with governor.lock:
+                    self.counters["spill_hits"] += 1
+                self._admit(key, value, size_of(value), spilled[2])
+                return value
+
+        with governor.lock:
+            self.counters["misses"] += 1
+        started = time.perf_counter()
+        value = build()
+        cost = time.perf_counter() - started
+        self._admit(key, value, size_of(value), cost)
+        return value
+
+    def invalidate(self, key=None):
+        """항목 하나 또는 전체 삭제 (spill 파일 포함)"""
+        removed = []
+        with self.governor.lock:
+            keys = list(self._entries) + list(self._spilled) if key is None else [key]
+            for k in keys:
+                self._entries.pop(k, None)
+                spilled = self._spilled.pop(k, None)
+                if spilled is not None:
+                    removed.append(spilled[0])
+        for path in removed:
+            _remove_quietly(path)
+
+    def _admit(self, key, value, size, cost):
+        governor = self.governor
+        with governor.lock:
+            if size > governor.budget_bytes:
+                # 예산보다 큰 값은 캐시하지 않음
+                self.counters["rejected"] += 1
+                return
+            entry = _Entry(value, size, max(cost, DEFAULT_REBUILD_COST), 0.0)
+            governor.touch(entry)
+            old = self._entries.pop(key, None)
+            self._entries[key] = entry
+            if old is None:
+                self.counters["inserts"] += 1
+        governor.enforce()
+
+    def _take(self, key) -> _Entry:
+        """내보낼 항목을 캐시에서 꺼냄 (governor.lock 을 잡은 상태에서 호출)"""
+        entry = self._entries.pop(key)
+        self.counters["evictions"] += 1
+        self.counters["evicted_bytes"] += entry.size
+        return entry
+
+    def _spill(self, key, entry: _Entry):
+        """꺼낸 항목을 디스크에 저장 (lock 없이 호출 - pickle 쓰기 동안 다른 tool 호출을 막지 않음)"""
+        governor = self.governor
+        if not self.spill or not governor.spill_enabled:
+            return
+        tmp_path = None
+        try:
+            path = governor.spill_path(self.name, key)
+            # 같은 키를 동시에 spill 해도 완성된 파일만 보이도록 임시 파일에 쓰고 교체
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry.value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            tmp_path = None
+            size = path.stat().st_size
+        except Exception:
+            with governor.lock:
+                self.counters["spill_errors"] += 1
+            if tmp_path is not None:
+                _remove_quietly(tmp_path)
+            return
+
+        with governor.lock:
+            # 쓰는 동안 다시 만들어진 항목이면 spill 파일은 필요 없음
+            stale = key in self._entries
+            if not stale:
+                self._spilled[key] = (path, size, entry.cost)
+                self.counters["spills"] += 1
+        if stale:
+            _remove_quietly(path)
+        else:
+            governor.trim_spill()
+
+    def _load_spilled(self, spilled):
+        path = spilled[0]
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            with self.governor.lock:
+                self.counters["spill_errors"] += 1
+            return None
+        finally:
+            _remove_quietly(path)
+
+
+class MemoryGovernor:
+    """프로세스 전체 메모리 예산과 저장소별 사용량 관리"""
+
+    def __init__(self, budget_bytes: int, rss_limit_bytes: int = None, spill_dir=None):
+        self.lock = threading.RLock()
+        self.budget_bytes = budget_bytes
+        self.rss_limit_bytes = rss_limit_bytes
+        self._spill_root = None
+        self.spill_enabled = True
+        self.spill_dir = None
+        self.set_spill_dir(spill_dir)
+        self._stores = {}
+        self._external = {}
+        self._reserved = defaultdict(int)
+        self._clock = 0.0
+        self._next_rss_check = 0.0
+        self.counters = defaultdict(int)
+
+    def configure(self, budget_bytes: int = None, rss_limit_bytes: int = None, spill_dir=None):
+        """parse_args 이후 설정 변경"""
+        with self.lock:
+            if budget_bytes is not None:
+                self.budget_bytes = budget_bytes
+            if rss_limit_bytes is not None:
+                self.rss_limit_bytes = rss_limit_bytes or None
+            if spill_dir is not None:
+                self.set_spill_dir(spill_dir)
+        self.enforce()
+
+    def set_spill_dir(self, spill_dir):
+        """
+        spill 디렉토리 지정
+        :param spill_dir: 경로, None 이면 첫 spill 때 임시 디렉토리 생성, False 이면 spill 사용 안 함
+        """
+        self.spill_enabled = spill_dir is not False
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+
+    def spill_path(self, store_name: str, key) -> Path:
+        with self.lock:
+            if self.spill_dir is None:
+                if self._spill_root is None:
+                    self._spill_root = Path(tempfile.mkdtemp(prefix="prowler-mcp-spill-"))
+                    atexit.register(shutil.rmtree, self._spill_root, True)
+                self.spill_dir = self._spill_root
+            spill_dir = self.spill_dir
+        spill_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha1(repr((store_name, key)).encode("utf-8")).hexdigest()
+        return spill_dir.joinpath(f"{store_name}-{digest}.pkl")
+
+    def trim_spill(self):
+        """spill 파일 총 크기가 한도를 넘으면 오래된 것부터 삭제 (파일 삭제는 lock 밖에서)"""
+        removed = []
+        with self.lock:
+            limit = self.budget_bytes * SPILL_LIMIT_RATIO
+            total = sum(store.spilled_bytes for store in self._stores.values())
+            for store in self._stores.values():
+                # dict 는 삽입 순서를 유지하므로 앞쪽이 가장 먼저 spill 된 항목
+                for key in list(store._spilled):
+                    if total <= limit:
+                        break
+                    path, size, _ = store._spilled.pop(key)
+                    removed.append(path)
+                    total -= size
+                    store.counters["spill_drops"] += 1
+        for path in removed:
+            _remove_quietly(path)
+
+    def store(self, name: str, spill: bool = True) -> CacheStore:
+        """이름으로 캐시 저장소를 가져오거나 새로 등록"""
+        with self.lock:
+            store = self._stores.get(name)
+            if store is None:
+                store = self._stores[name] = CacheStore(self, name, spill=spill)
+            return store
+
+    def register_external(self, name: str, size_fn):
+        """내보낼 수는 없지만 사용량에 포함해야 하는 저장소 등록 (예: follow 상태)"""
+        with self.lock:
+            self._external[name] = size_fn
+
+    @contextmanager
+    def reserve(self, name: str, nbytes: int):
+        """
+        파싱 버퍼처럼 잠깐 쓰는 메모리를 사용량에 포함시키고 그만큼 캐시를 비움
+        예상치는 대략적인 값이므로 캐시를 모두 비워도 예산을 넘으면 기록만 하고 그대로 진행합니다.
+        :return: 예산 안에 들어왔는지 여부 (with ... as fits)
+        """
+        with self.lock:
+            self._reserved[name] += nbytes
+            self.counters["reservations"] += 1
+        try:
+            self.enforce()
+            with self.lock:
+                fits = self.accounted_bytes() <= self.budget_bytes
+                if not fits:
+                    self.counters["oversized_reservations"] += 1
+            yield fits
+        finally:
+            with self.lock:
+                self._reserved[name] -= nbytes
+
+    def touch(self, entry: _Entry):
+        """GreedyDual-Size: 우선순위 = 현재 기준값 + 바이트당 재생성 비용"""
+        entry.priority = self._clock + entry.cost / max(entry.size, 1)
+
+    def accounted_bytes(self) -> int:
+        with self.lock:
+            total = sum(store.bytes_used for store in self._stores.values())
+            total += sum(self._reserved.values())
+            total += sum(self._external_sizes().values())
+            return total
+
+    def _external_sizes(self) -> dict:
+        sizes = {}
+        for name, size_fn in self._external.items():
+            try:
+                sizes[name] = int(size_fn())
+            except Exception:
+                sizes[name] = 0
+        return sizes
+
+    def _rss_exceeded(self) -> bool:
+        """RSS 한도 초과 여부 (RSS_CHECK_INTERVAL 초에 한 번만 확인)"""
+        if not self.rss_limit_bytes:
+            return False
+        now = time.monotonic()
+        if now < self._next_rss_check:
+            return False
+        self._next_rss_check = now + RSS_CHECK_INTERVAL
+        rss = current_rss()
+        return rss is not None and rss > self.rss_limit_bytes
+
+    def _collect_victims(self) -> list:
+        """
+        예산을 넘었으면 우선순위가 가장 낮은 항목부터 꺼냄 (lock 을 잡은 상태에서 호출)
+        바이트 예산을 넘으면 예산까지, RSS 한도를 넘으면 집계된 사용량의 RSS_EVICTION_RATIO 까지 줄입니다.
+        """
+        accounted = self.accounted_bytes()
+        if accounted > self.budget_bytes:
+            self.counters["pressure_events"] += 1
+            target = self.budget_bytes
+        elif self._rss_exceeded():
+            self.counters["rss_pressure_events"] += 1
+            target = int(accounted * RSS_EVICTION_RATIO)
+        else:
+            return []
+
+        victims = []
+        while accounted > target:
+            victim = None
+            for store in self._stores.values():
+                for key, entry in store._entries.items():
+                    if victim is None or entry.priority < victim[2].priority:
+                        victim = (store, key, entry)
+            if victim is None:
+                # 내보낼 캐시 항목이 없음 (예약 버퍼나 외부 저장소만 남음)
+                self.counters["unrelievable_pressure"] += 1
+                break
+            store, key, entry = victim
+            self._clock = entry.priority
+            victims.append((store, key, store._take(key)))
+            accounted -= entry.size
+            self.counters["evictions"] += 1
+        return victims
+
+    def enforce(self):
+        """
+        예산을 넘으면 우선순위가 가장 낮은 항목부터 내보냄
+        lock 안에서는 항목만 꺼내고, spill 파일 쓰기는 lock 을 놓은 뒤에 합니다.
+        """
+        with self.lock:
+            victims = self._collect_victims()
+        for store, key, entry in victims:
+            store._spill(key, entry)
+
+    def snapshot(self) -> dict:
+        """진단용 상태"""
+        with self.lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "rss_limit_bytes": self.rss_limit_bytes,
+                "rss_bytes": current_rss(),
+                "accounted_bytes": self.accounted_bytes(),
+                "reserved_bytes": dict(self._reserved),
+                "external_bytes": self._external_sizes(),
+                "spill_dir": str(self.spill_dir) if self.spill_dir else None,
+                "spill_enabled": self.spill_enabled,
+                "counters": dict(self.counters),
+                "stores": {
+                    name: {
+                        "entries": len(store._entries),
+                        "bytes": store.bytes_used,
+                        "spilled_entries": len(store._spilled),
+                        "spilled_bytes": store.spilled_bytes,
+                        "counters": dict(store.counters),
+                    }
+                    for name, store in self._stores.items()
+                },
+            }
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -72,7 +72,7 @@ def parse_prowler_report_asff_json(json_content, preview_length=500) -> dict:
 
         result = {
             'file_type': 'Prowler JSON Report',
-            "data_type": type(json_content).__name__,
+            "data_type": type(json_data).__name__,
             # 'file_size': file_size,
             # 'text_length': text_length,
             'keyword_counts': keyword_counts,
@@ -93,6 +93,102 @@ def parse_prowler_report_asff_json(json_content, preview_length=500) -> dict:
         print(f"Error parsing ASFF JSON report: {e}")
         return {"error": str(e)}
 
+KEYWORD_LIST = ['PASS', 'FAIL', 'CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+
+
+def classify_finding(finding: dict) -> tuple:
+    """
+    단일 finding(ASFF / OCSF / CSV 행)의 상태와 심각도를 정규화
+    :param finding: JSON 객체 또는 csv.DictReader 행
+    :return: (status, severity) - status 는 'PASS' / 'FAIL' / '', severity 는 대문자 라벨
+    """
+    if not isinstance(finding, dict):
+        return '', ''
+
+    # ASFF: Compliance.Status / Severity.Label
+    compliance = finding.get("Compliance")
+    if isinstance(compliance, dict):
+        status = "PASS" if str(compliance.get("Status", "")).upper() == "PASSED" else "FAIL"
+        severity = finding.get("Severity", {})
+        severity = severity.get("Label", "") if isinstance(severity, dict) else severity
+        return status, str(severity or "").upper()
+
+    # OCSF JSON: status_code / severity, CSV: STATUS / SEVERITY
+    status = (finding.get("status_code") or finding.get("STATUS")
+              or finding.get("Status") or finding.get("status") or "")
+    severity = (finding.get("SEVERITY") or finding.get("Severity")
+                or finding.get("severity") or "")
+    if isinstance(severity, dict):
+        severity = severity.get("Label", "")
+    status = str(status).strip().upper()
+    if status == "PASSED":
+        status = "PASS"
+    elif status == "FAILED":
+        status = "FAIL"
+    return status, str(severity).strip().upper()
+
+
+def _first_resource(finding: dict, key: str) -> dict:
+    resources = finding.get(key)
+    if isinstance(resources, list) and resources and isinstance(resources[0], dict):
+        return resources[0]
+    return {}
+
+
+def _nested(data: dict, *keys):
+    for key in keys:
+        if not isinstance(data, dict):
+            return ""
+        data = data.get(key)
+    return data or ""
+
+
+def finding_dimensions(finding: dict) -> dict:
+    """
+    그룹 집계용 finding 속성 추출 (ASFF / OCSF / CSV 행)
+    :param finding: JSON 객체 또는 csv.DictReader 행
+    :return: account, region, service, check, severity, status 를 담은 dict
+    """
+    status, severity = classify_finding(finding)
+    if not isinstance(finding, dict):
+        return {"account": "", "region": "", "service": "", "check": "",
+                "severity": severity, "status": status}
+
+    if isinstance(finding.get("Compliance"), dict):
+        # ASFF: GeneratorId 는 'prowler-<check_id>' 형식
+        resource = _first_resource(finding, "Resources")
+        check = str(finding.get("GeneratorId", "")).removeprefix("prowler-")
+        account = finding.get("AwsAccountId", "")
+        region = finding.get("Region") or resource.get("Region", "")
+        service = _nested(finding, "ProductFields", "ServiceName")
+    elif isinstance(finding.get("metadata"), dict):
+        # OCSF JSON
+        resource = _first_resource(finding, "resources")
+        check = _nested(finding, "metadata", "event_code")
+        account = _nested(finding, "cloud", "account", "uid")
+        region = _nested(finding, "cloud", "region") or resource.get("region", "")
+        service = _nested(resource, "group", "name")
+    else:
+        # CSV (Prowler v3: ACCOUNT_ID, v4: ACCOUNT_UID)
+        check = finding.get("CHECK_ID", "")
+        account = finding.get("ACCOUNT_UID") or finding.get("ACCOUNT_ID", "")
+        region = finding.get("REGION", "")
+        service = finding.get("SERVICE_NAME", "")
+
+    check = str(check).strip()
+    if not service and check:
+        # Prowler check id 는 '<service>_<내용>' 형식
+        service = check.split("_", 1)[0]
+    return {
+        "account": str(account).strip(),
+        "region": str(region).strip(),
+        "service": str(service).strip(),
+        "check": check,
+        "severity": severity,
+        "status": status,
+    }
+
+
 if __name__ == "__main__":
     report = "../prowler-reports/prowler-report-20250715-011202.asff.json"
     with open(report, 'r', encoding='utf-8') as f:
@@ -8,6 +8,7 @@ import os
 import re
 import yaml
 import logging
+from contextlib import contextmanager
 from datetime import datetime
 from idlelib.browser import file_open
 from pathlib import Path
@@ -17,6 +18,13 @@ import requests
 from fastmcp import FastMCP
 import argparse
 from parser import *
+from follow import ReportFollowRegistry
+from aggregate import FindingAggregator
+from sources import DEFAULT_SCAN_WORKERS, ReportRoot, ReportSources, parse_root_spec
+from ingest import open_report
+import serving
+from serving import add_transport_arguments, run_server
+from memory import DEFAULT_BUDGET_MB, MemoryGovernor
 from pprint import pp
 from pydantic import BaseModel, Field, ValidationError
 
@@ -34,6 +42,10 @@ BASEDIR = Path(__file__).resolve().parent.parent
 OUTPUT_DIR = BASEDIR.joinpath("prowler-reports")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# 리포트 루트 목록 (기본 루트는 OUTPUT_DIR, --report-root 로 추가)
+DEFAULT_ROOT_NAME = "default"
+REPORT_SOURCES = ReportSources([ReportRoot(DEFAULT_ROOT_NAME, OUTPUT_DIR)])
+
 # IaC YAML Writer 설정
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = SCRIPT_DIR.parent  # 프로젝트 루트 디렉토리 (src 폴더의 상위)
@@ -50,6 +62,24 @@ except Exception as e:
 _iac_root_path = IAC_OUTPUT_DIR.resolve()
 logger.info(f"IaC root directory set to: {_iac_root_path}")
 
+# 작성 중인 리포트의 follow 상태 (경로별 바이트 오프셋, 누적 카운트)
+_report_followers = ReportFollowRegistry()
+
+# 프로세스 전체 메모리 예산 (캐시, follow 상태, 파싱 버퍼를 함께 집계)
+_memory = MemoryGovernor(DEFAULT_BUDGET_MB * 1024 * 1024)
+_memory.register_external("follow", _report_followers.approximate_bytes)
+_analysis_cache = _memory.store("analysis")
+_summary_cache = _memory.store("summary")
+
+# 파일 크기 대비 파싱 중 필요한 메모리의 대략적인 배수
+# (참고용 예상치 - 예산을 넘으면 캐시를 비우고 경고만 남긴 뒤 그대로 분석)
+HTML_PARSE_FACTOR = 10   # 디코딩된 문자열 + BeautifulSoup 트리
+JSON_PARSE_FACTOR = 6    # 본문 복사본 + 파싱된 객체
+TEXT_DECODE_FACTOR = 2   # 본문 복사본 + 디코딩된 문자열
+
+# finding 단위로 집계할 수 있는 리포트 확장자
+AGGREGATE_SUFFIXES = {'.csv', '.json', '.json-asff'}
+
 # --- Pydantic Model Definition for YAML Writer ---
 class YamlWriteParameters(BaseModel):
     """Parameters for writing a YAML file."""
@@ -100,6 +130,22 @@ def parse_args():
         help="분석할 Prowler 결과 파일이 있는 디렉토리 경로 (기본값: ./output)",
     )
 
+    p.add_argument(
+        "--report-root",
+        action="append",
+        default=[],
+        metavar="NAME=PATH",
+        help="추가로 분석할 리포트 루트 디렉토리 (여러 번 지정 가능, 하위 폴더까지 재귀 탐색). "
+             f"이름은 서로 달라야 하며 '{DEFAULT_ROOT_NAME}' 은 --output-dir 이 사용합니다",
+    )
+
+    p.add_argument(
+        "--scan-workers",
+        type=int,
+        default=DEFAULT_SCAN_WORKERS,
+        help=f"리포트 루트를 동시에 스캔할 스레드 수 (기본값: {DEFAULT_SCAN_WORKERS})",
+    )
+
     p.add_argument(
         "--no-mcp-run",
         type=bool,
@@ -107,25 +153,74 @@ def parse_args():
         help="MCP 서버를 실행하지 않습니다. (디버깅용)",
     )
 
+    # stdio 외에 여러 세션이 공유하는 HTTP/SSE 전송 모드
+    add_transport_arguments(p)
+
+    p.add_argument(
+        "--memory-budget-mb",
+        type=int,
+        default=DEFAULT_BUDGET_MB,
+        help=f"캐시와 파싱 버퍼에 사용할 메모리 예산 (MB, 기본값: {DEFAULT_BUDGET_MB})",
+    )
+    p.add_argument(
+        "--memory-rss-limit-mb",
+        type=int,
+        default=0,
+        help="프로세스 RSS 가 이 값을 넘으면 캐시 사용량을 80%%로 줄입니다 (MB, 0 이면 사용 안 함, Linux 전용)",
+    )
+    p.add_argument(
+        "--spill-dir",
+        type=str,
+        default=None,
+        help="캐시에서 내보낸 분석 결과를 저장할 디렉토리 (기본값: 임시 디렉토리)",
+    )
+
     args = p.parse_args()
 
     # OUTPUT_DIR 업데이트
     OUTPUT_DIR = Path(args.output_dir)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    # 리포트 루트 업데이트 (기본 루트 + --report-root)
+    roots = [ReportRoot(DEFAULT_ROOT_NAME, OUTPUT_DIR)]
+    roots += [parse_root_spec(spec) for spec in args.report_root]
+    try:
+        REPORT_SOURCES.configure(roots, max_workers=args.scan_workers)
+    except ValueError as e:
+        p.error(str(e))
+
+    # 메모리 예산 업데이트
+    _memory.configure(
+        budget_bytes=args.memory_budget_mb * 1024 * 1024,
+        rss_limit_bytes=args.memory_rss_limit_mb * 1024 * 1024,
+        spill_dir=args.spill_dir,
+    )
     return args
 
+def _scan_reports(suffixes=None):
+    """모든 리포트 루트를 동시에 스캔하고 루트별 소요 시간 기록"""
+    scan = REPORT_SOURCES.scan(suffixes)
+    for name, stats in scan.stats.items():
+        logger.info(f"Report root '{name}' scanned: {stats.files} files, "
+                    f"{stats.directories} dirs in {stats.elapsed * 1000:.1f} ms")
+    return scan
+
+def _root_labels():
+    return ", ".join(f"{root.name}({root.path})" for root in REPORT_SOURCES.roots)
+
+def get_latest_report_entry():
+    """모든 리포트 루트에서 최신 파일 찾기"""
+    latest = _scan_reports().latest()
+    if latest is None:
+        return None, f"파일이 없습니다: {_root_labels()}"
+    return latest, None
+
 def get_latest_file():
     """최신 파일 찾기"""
-    if not OUTPUT_DIR.exists():
-        return None, f"Output 디렉토리가 존재하지 않습니다: {OUTPUT_DIR}"
-    
-    files = {f for f in OUTPUT_DIR.iterdir() if f.is_file()}
-    files.discard(Path(OUTPUT_DIR).joinpath('.DS_Store'))
-    if not files:
-        return None, f"파일이 없습니다: {OUTPUT_DIR}"
-    
-    latest = max(files, key=lambda f: f.stat().st_mtime)
-    return latest, None
+    latest, error = get_latest_report_entry()
+    if error:
+        return None, error
+    return latest.path, None
 
 def analyze_html_file(content, file_path):
     """HTML 파일 분석 (안전한 버전)"""
@@ -159,19 +254,25 @@ def analyze_html_file(content, file_path):
     except Exception as e:
         return {"error": f"HTML 분석 오류: {str(e)}"}
 
-def analyze_csv_file(content, file_path):
-    """CSV 파일 분석 (안전한 버전)"""
+def analyze_csv_file(report, file_path):
+    """CSV 파일 분석 (안전한 버전)
+    전체를 디코딩하지 않고 줄 수는 바이트로 세고, 헤더와 샘플 행만 디코딩합니다.
+    """
     try:
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
+        # 헤더 + 처음 3개 데이터 행
+        lines = list(report.iter_lines(limit=4))
         
         if not lines:
             return {"error": "빈 CSV 파일"}
         
+        # 기존과 같이 비어 있지 않은 줄만 셈
+        total_lines = report.count_lines(skip_blank=True)
         result = {
             "file_type": "Prowler CSV Results",
-            "total_lines": len(lines),
+            "encoding": report.encoding,
+            "total_lines": total_lines,
             "header": lines[0] if lines else "",
-            "data_rows": len(lines) - 1 if len(lines) > 1 else 0
+            "data_rows": total_lines - 1 if total_lines > 1 else 0
         }
         
         # 샘플 데이터
@@ -207,27 +308,68 @@ def analyze_json_file(content, file_path):
     except Exception as e:
         return {"error": f"JSON 분석 오류: {str(e)}"}
 
+def _report_cache_key(file_path, *extra):
+    """파일이 바뀌면 달라지는 캐시 키 (경로, 수정 시각, 크기)"""
+    file_stat = file_path.stat()
+    return (str(file_path.resolve()), file_stat.st_mtime_ns, file_stat.st_size) + extra
+
+@contextmanager
+def _parse_buffer(file_path, nbytes):
+    """파싱 버퍼 예약 - 예상 사용량이 예산을 넘어도 캐시만 비우고 분석은 계속 진행"""
+    with _memory.reserve("parse_buffers", nbytes) as fits:
+        if not fits:
+            logger.warning(f"Parsing {file_path} may exceed the memory budget "
+                           f"(estimated {nbytes / 1024 / 1024:,.0f} MB, caches evicted)")
+        yield
+
+def _analyze_report_file(file_path, file_preview_length):
+    """확장자에 따른 분석 (바이트 뷰로 열고 필요한 부분만 디코딩)"""
+    file_ext = file_path.suffix.lower()
+
+    with open_report(file_path) as report:
+        if file_ext in ['.html', '.htm']:
+            # analysis = analyze_html_file(content, latest_file)
+            # analysis = parse_prowler_report_html_2(content, latest_file)
+            with _parse_buffer(file_path, report.body_length * HTML_PARSE_FACTOR):
+                analysis = parse_prowler_report_html(report.text(), file_preview_length)
+        elif file_ext == '.csv':
+            analysis = analyze_csv_file(report, file_path)
+        elif file_ext in ['.json', '.json-asff']:
+            # analysis = analyze_json_file(file_content, file_path)
+            with _parse_buffer(file_path, report.body_length * JSON_PARSE_FACTOR):
+                analysis = parse_prowler_report_asff_json(report.json_source())
+        else:
+            preview = report.preview(201)
+            analysis = {
+                "file_type": f"텍스트 파일 ({file_ext})",
+                "content_length": report.body_length,
+                "line_count": report.count_lines(),
+                "preview": preview[:200] + "..." if len(preview) > 200 else preview
+            }
+    return analysis
+
 # ========== PROWLER ANALYSIS TOOLS ==========
 
 @mcp.tool()
 def get_latest_prowler_file() -> str:
-    """output 폴더에서 가장 최신 파일 정보를 가져옵니다."""
-    latest_file, error = get_latest_file()
+    """모든 리포트 루트(하위 폴더 포함)에서 가장 최신 파일 정보를 가져옵니다."""
+    latest_entry, error = get_latest_report_entry()
     
     if error:
         return f"❌ {error}"
     
-    file_stat = latest_file.stat()
+    latest_file = latest_entry.path
     result = f"""
  **최신 Prowler 결과 파일**
 
 • **파일명**: {latest_file.name}
 • **전체 경로**: {latest_file}
-• **파일 크기**: {file_stat.st_size:,} bytes
-• **수정 일시**: {datetime.fromtimestamp(file_stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')}
+• **리포트 루트**: {latest_entry.root}
+• **파일 크기**: {latest_entry.size:,} bytes
+• **수정 일시**: {datetime.fromtimestamp(latest_entry.mtime).strftime('%Y-%m-%d %H:%M:%S')}
 • **파일 확장자**: {latest_file.suffix}
 
- **선택 근거**: 이 파일이 {OUTPUT_DIR} 폴더에서 가장 최근에 수정된 파일로, 최신 보안 점검 결과를 포함하고 있습니다.
+ **선택 근거**: 이 파일이 전체 리포트 루트({len(REPORT_SOURCES.roots)}개)에서 가장 최근에 수정된 파일로, 최신 보안 점검 결과를 포함하고 있습니다.
 """
     return result
 
@@ -244,29 +386,11 @@ def analyze_prowler_results(file_path, file_preview_length:int=500) -> str:
     #     return f"❌ {error}"
     file_path = Path(file_path)
     try:
-        # 파일 읽기
-        with open(file_path, 'r', encoding='utf-8') as file:
-            file_content = file.read()
-        
-        # 파일 확장자에 따른 분석
-        file_ext = file_path.suffix.lower()
-
-        if file_ext in ['.html', '.htm']:
-            # analysis = analyze_html_file(content, latest_file)
-            # analysis = parse_prowler_report_html_2(content, latest_file)
-            analysis = parse_prowler_report_html(file_content, file_preview_length)
-        elif file_ext == '.csv':
-            analysis = analyze_csv_file(file_content, file_path)
-        elif file_ext in ['.json', '.json-asff']:
-            # analysis = analyze_json_file(file_content, file_path)
-            analysis = parse_prowler_report_asff_json(file_content)
-        else:
-            analysis = {
-                "file_type": f"텍스트 파일 ({file_ext})",
-                "content_length": len(file_content),
-                "line_count": len(file_content.splitlines()),
-                "preview": file_content[:200] + "..." if len(file_content) > 200 else file_content
-            }
+        # 같은 파일(경로, 수정 시각, 크기)이면 캐시된 분석 결과 사용
+        analysis = _analysis_cache.get_or_build(
+            _report_cache_key(file_path, file_preview_length),
+            lambda: _analyze_report_file(file_path, file_preview_length),
+        )
 
         # 오류 체크
         if "error" in analysis:
@@ -334,7 +458,7 @@ f"""###  보안 점검 상태 (키워드 기반)
         else:
             report += f"""
 ###  파일 정보
-• **내용 길이**: {analysis.get('content_length', 0)}자
+• **내용 길이**: {analysis.get('content_length', 0):,} bytes
 • **라인 수**: {analysis.get('line_count', 0)}개
 
 ###  내용 미리보기
@@ -371,13 +495,15 @@ def get_security_summary(file_path) -> str:
     #     return f"❌ {error}"
     file_path = Path(file_path)
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_content = f.read()
-        
-        # 간단한 통계
-        pass_count = len(re.findall(r'\bPASS\b', file_content, re.IGNORECASE))
-        fail_count = len(re.findall(r'\bFAIL\b', file_content, re.IGNORECASE))
-        critical_count = len(re.findall(r'\bCRITICAL\b', file_content, re.IGNORECASE))
+        # 간단한 통계 (ASCII 호환 인코딩이면 디코딩 없이 바이트로 집계)
+        def count_keywords():
+            with open_report(file_path) as report:
+                return report.count_keywords(['PASS', 'FAIL', 'CRITICAL'])
+
+        counts = _summary_cache.get_or_build(_report_cache_key(file_path), count_keywords)
+        pass_count = counts['PASS']
+        fail_count = counts['FAIL']
+        critical_count = counts['CRITICAL']
         
         total_checks = pass_count + fail_count
         pass_rate = (pass_count / total_checks * 100) if total_checks > 0 else 0
@@ -423,27 +549,55 @@ def get_security_summary(file_path) -> str:
 
 @mcp.tool()
 def get_prowler_reports_list() -> List[tuple]:
-    """Prowler 결과 파일 목록을 가져옵니다.
+    """모든 리포트 루트(하위 폴더 포함)의 Prowler 결과 파일 목록을 가져옵니다.
     :param
         None
     :return:
-        list[]: Prowler 결과 파일 목록
+        list[]: Prowler 결과 파일 목록 (파일명, 경로, 크기, 확장자, 리포트 루트), 최신순
     """
     try:
-        files = [f for f in OUTPUT_DIR.iterdir() if f.is_file()]
-        if not files:
+        entries = _scan_reports().entries
+        if not entries:
             return []
 
         report_list = []
-        for file in sorted(files, key=lambda f: f.stat().st_mtime, reverse=True):
-            file_stat = file.stat()
-            if file.name == '.DS_Store':
-                continue
-            report_list.append((file.name, file, f'{round(file_stat.st_size/1024):,} KB', file.suffix))
+        for entry in sorted(entries, key=lambda e: e.mtime, reverse=True):
+            report_list.append((entry.name, entry.path, f'{round(entry.size/1024):,} KB', entry.suffix, entry.root))
         return report_list
     except Exception as e:
         return [(f"❌ 파일 목록 가져오기 실패: {str(e)}",)]
 
+@mcp.tool()
+def get_report_sources_status() -> str:
+    """등록된 리포트 루트 목록과 루트별 파일 수, 스캔 소요 시간을 보여줍니다."""
+    try:
+        scan = _scan_reports()
+        report = f"""
+# 🗂️ 리포트 루트 상태
+
+• **루트 수**: {len(scan.stats)}개
+• **전체 파일 수**: {len(scan.entries):,}개
+• **전체 스캔 시간**: {scan.elapsed * 1000:.1f} ms (스캔 스레드 {REPORT_SOURCES.max_workers}개)
+"""
+        for name, stats in scan.stats.items():
+            report += f"""
+### {name}
+• **경로**: {stats.root.path}
+• **파일 / 디렉토리 수**: {stats.files:,}개 / {stats.directories:,}개
+• **스캔 시간**: {stats.elapsed * 1000:.1f} ms
+"""
+            for error in stats.errors[:5]:
+                report += f"• ⚠️ {error}\n"
+
+        report += f"""
+**조회 시점**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+"""
+        return report
+
+    except Exception as e:
+        return f"❌ 리포트 루트 스캔 중 오류 발생: {str(e)}"
+
+
 @mcp.tool()
 def get_file_content(file_path: str) -> str:
     """파일 내용을 가져옵니다.
@@ -455,17 +609,214 @@ def get_file_content(file_path: str) -> str:
         if not file_path.exists():
             return f"❌ 파일이 존재하지 않습니다: {file_path}"
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        # 파일 내용이 2MB를 초과하면 미리보기만 제공
-        if len(content) > 2 * 1024 * 1024:  # 2MB
-            return f"📄 파일 내용이 너무 깁니다. 미리보기:\n{content[:2000]}..."
-        return content
+        with open_report(file_path) as report:
+            # 파일 내용이 2MB를 초과하면 앞부분만 디코딩해서 미리보기로 제공
+            if report.body_length > 2 * 1024 * 1024:  # 2MB
+                return f"📄 파일 내용이 너무 깁니다. 미리보기:\n{report.preview(2000)}..."
+            with _parse_buffer(file_path, report.body_length * TEXT_DECODE_FACTOR):
+                return report.text()
 
     except Exception as e:
         return f"❌ 파일 읽기 실패: {str(e)}"
 
 
+@mcp.tool()
+def follow_prowler_report(file_path: str, reset: bool = False) -> str:
+    """실행 중인 Prowler 스캔이 작성 중인 리포트를 이어서 읽고 누적 통계를 보여줍니다.
+    이전 호출 이후 새로 추가된 완결 레코드(CSV 행, JSON 배열 원소, JSON-lines)만 파싱합니다.
+    :param file_path: 추적할 리포트 파일 경로 (.csv, .json, .asff.json, .ocsf.json)
+    :param reset: True 이면 오프셋과 누적 카운트를 초기화하고 처음부터 다시 읽습니다
+    :return: 진행 상황 문자열
+    """
+    try:
+        file_path = Path(file_path)
+        if not file_path.exists():
+            return f"❌ 파일이 존재하지 않습니다: {file_path}"
+
+        status = _report_followers.poll(file_path, reset=reset)
+        keywords = status["keyword_counts"]
+        file_size = status["file_size"]
+        progress = (status["offset"] / file_size * 100) if file_size > 0 else 0
+        total_checks = keywords["PASS"] + keywords["FAIL"]
+        pass_rate = (keywords["PASS"] / total_checks * 100) if total_checks > 0 else 0
+
+        return f"""
+# 📡 Prowler 리포트 추적
+
+##  진행 상황
+• **파일명**: {file_path.name}
+• **형식**: {status['format']} ({status['encoding']})
+• **읽은 위치**: {status['offset']:,} / {file_size:,} bytes ({progress:.1f}%)
+• **이번에 읽은 양**: {status['bytes_read']:,} bytes, 신규 레코드 {status['new_records']}개
+• **대기 중인 미완결 데이터**: {status['pending_bytes']:,} bytes
+• **누적 레코드 수**: {status['total_records']}개 (파싱 오류 {status['parse_errors']}개)
+• **리포트 종료 여부**: {"✅ 완료" if status['complete'] else "⏳ 작성 중 또는 판단 불가"}
+
+##  누적 점검 상태
+• ✅ **PASS**: {keywords['PASS']}개
+• ❌ **FAIL**: {keywords['FAIL']}개
+• **통과율**: {pass_rate:.1f}%
+
+### 🚨 심각도 분포
+• 🔴 **CRITICAL**: {keywords['CRITICAL']}개
+• 🟠 **HIGH**: {keywords['HIGH']}개
+• 🟡 **MEDIUM**: {keywords['MEDIUM']}개
+• 🟢 **LOW**: {keywords['LOW']}개
+
+**조회 시점**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+"""
+
+    except Exception as e:
+        return f"❌ 리포트 추적 중 오류 발생: {str(e)}"
+
+
+@mcp.tool()
+def aggregate_prowler_findings(group_by: str = "account", top_n: int = 20,
+                               file_paths: str = "", max_groups: int = 30) -> str:
+    """여러 리포트의 finding 을 계정 / 리전 / 서비스 등으로 묶어 통과율과 실패 check 상위 N개를 집계합니다.
+    모든 리포트를 한 번씩만 스트리밍으로 읽으며, 상위 N개는 고정 크기 heavy hitter 구조로 추적합니다.
+    그룹은 최대 10,000개까지 따로 추적하고, 그 뒤에 나온 그룹은 '(기타)' 그룹으로 합칩니다.
+    :param group_by: 쉼표로 구분한 그룹 키 (account, region, service, check, severity, status, report)
+    :param top_n: 그룹별 / 전체 실패 check 상위 개수 (기본값: 20)
+    :param file_paths: 쉼표로 구분한 리포트 경로 (비워 두면 모든 리포트 루트의 CSV / JSON 리포트 전체)
+    :param max_groups: 보고서에 표시할 최대 그룹 수 (실패 건수 순, 기본값: 30)
+    :return: 집계 결과 문자열
+    """
+    try:
+        keys = [k.strip().lower() for k in group_by.split(",") if k.strip()]
+        aggregator = FindingAggregator(keys or ["account"], top_n=top_n)
+
+        scan = None
+        if file_paths.strip():
+            files = [(Path(f.strip()), f.strip()) for f in file_paths.split(",") if f.strip()]
+        else:
+            # report 그룹 키는 루트 이름 + 루트 기준 상대 경로 (다른 루트/폴더의 같은 파일명 구분)
+            scan = _scan_reports(AGGREGATE_SUFFIXES)
+            root_paths = {root.name: root.path for root in REPORT_SOURCES.roots}
+            files = sorted((entry.path, f"{entry.root}:{entry.path.relative_to(root_paths[entry.root]).as_posix()}")
+                           for entry in scan.entries)
+        if not files:
+            return f"❌ 집계할 리포트가 없습니다: {_root_labels()}"
+
+        skipped = []
+        for file, label in files:
+            if not file.is_file() or file.suffix.lower() not in AGGREGATE_SUFFIXES:
+                skipped.append(file.name)
+                continue
+            aggregator.add_report(file, label)
+
+        totals = aggregator.totals()
+        report = f"""
+# 📊 Prowler finding 집계
+
+##  전체
+• **리포트 수**: {aggregator.reports}개{f" (건너뜀: {', '.join(skipped)})" if skipped else ""}
+• **finding 수**: {aggregator.findings:,}개 (파싱 오류 {aggregator.parse_errors}개)
+• ✅ **PASS**: {totals.passed:,}개 / ❌ **FAIL**: {totals.failed:,}개
+• **통과율**: {totals.pass_rate:.1f}%
+• **그룹 키**: {', '.join(aggregator.group_by)} ({len(aggregator.groups):,}개 그룹)
+"""
+        if aggregator.other_findings:
+            report += (f"• ⚠️ 그룹이 {aggregator.max_tracked_groups:,}개를 넘어 finding "
+                       f"{aggregator.other_findings:,}개를 '(기타)' 그룹으로 합쳤습니다\n")
+        for label, reason in aggregator.partial_reports[:10]:
+            report += f"• ⚠️ 일부만 집계된 리포트: {label} ({reason})\n"
+        if scan is not None:
+            report += f"• **리포트 루트 스캔**: {len(scan.stats)}개 루트, {scan.elapsed * 1000:.1f} ms\n"
+        report += f"""
+##  전체 실패 check 상위 {top_n}개
+"""
+        for rank, (check, count) in enumerate(aggregator.global_failing.top(top_n), 1):
+            report += f"{rank}. `{check}` - {count:,}건\n"
+
+        report += f"""
+##  그룹별 결과 (실패 건수 순, 상위 {max_groups}개)
+"""
+        for key, stats in aggregator.ranked_groups(max_groups):
+            label = " / ".join(f"{name}={value}" for name, value in zip(aggregator.group_by, key))
+            severities = ", ".join(f"{sev} {count}" for sev, count
+                                   in sorted(stats.severity_fail.items(), key=lambda kv: -kv[1]))
+            report += f"""
+### {label}
+• **finding 수**: {stats.total:,}개 (PASS {stats.passed:,} / FAIL {stats.failed:,})
+• **통과율**: {stats.pass_rate:.1f}%
+• **실패 심각도**: {severities or '없음'}
+"""
+            for rank, (check, count, error) in enumerate(stats.failing_checks.top(top_n), 1):
+                report += f"{rank}. `{check}` - {count:,}건{f' (최대 오차 ±{error})' if error else ''}\n"
+
+        report += f"""
+**분석 시점**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+"""
+        return report
+
+    except ValueError as e:
+        return f"❌ {str(e)}"
+    except Exception as e:
+        return f"❌ finding 집계 중 오류 발생: {str(e)}"
+
+
+@mcp.tool()
+def get_memory_diagnostics() -> str:
+    """서버 메모리 예산, 캐시별 사용량, 메모리 압박 및 eviction 통계를 보여줍니다."""
+    try:
+        snapshot = _memory.snapshot()
+        counters = snapshot["counters"]
+        mb = 1024 * 1024
+        budget = snapshot["budget_bytes"]
+        accounted = snapshot["accounted_bytes"]
+        rss = snapshot["rss_bytes"]
+        rss_limit = snapshot["rss_limit_bytes"]
+
+        report = f"""
+# 🧠 메모리 진단
+
+##  예산
+• **메모리 예산**: {budget / mb:,.1f} MB
+• **집계된 사용량**: {accounted / mb:,.2f} MB ({accounted / budget * 100 if budget else 0:.1f}%)
+• **프로세스 RSS**: {f"{rss / mb:,.1f} MB" if rss is not None else "확인 불가"}{f" (한도 {rss_limit / mb:,.0f} MB)" if rss_limit else ""}
+• **파싱 버퍼 예약**: {sum(snapshot['reserved_bytes'].values()) / mb:,.2f} MB
+• **기타 상태 (follow 등)**: {sum(snapshot['external_bytes'].values()) / 1024:,.1f} KB
+• **spill 디렉토리**: {snapshot['spill_dir'] or ("사용 시 임시 디렉토리 생성" if snapshot['spill_enabled'] else "사용 안 함")}
+
+##  메모리 압박
+• **압박 발생 횟수 (예산 / RSS)**: {counters.get('pressure_events', 0)}회 / {counters.get('rss_pressure_events', 0)}회
+• **eviction 횟수**: {counters.get('evictions', 0)}회
+• **비울 캐시가 없던 압박**: {counters.get('unrelievable_pressure', 0)}회
+• **파싱 버퍼 예약 / 예산 초과 상태로 진행**: {counters.get('reservations', 0)} / {counters.get('oversized_reservations', 0)}
+
+##  캐시별 상태
+"""
+        for name, store in snapshot["stores"].items():
+            c = store["counters"]
+            report += f"""
+### {name}
+• **항목 수**: {store['entries']}개 ({store['bytes'] / mb:,.2f} MB)
+• **spill 항목 수**: {store['spilled_entries']}개 ({store['spilled_bytes'] / mb:,.2f} MB)
+• **hit / miss / spill hit**: {c.get('hits', 0)} / {c.get('misses', 0)} / {c.get('spill_hits', 0)}
+• **eviction / spill / 예산 초과로 거부**: {c.get('evictions', 0)} / {c.get('spills', 0)} / {c.get('rejected', 0)}
+"""
+
+        # HTTP/SSE 모드의 tool 실행 통계
+        if serving.active_middleware is not None:
+            execution = serving.active_middleware.snapshot()
+            report += f"""
+##  tool 실행 (HTTP/SSE)
+• **워커 스레드 / 최대 동시 호출**: {execution['workers']} / {execution['max_concurrency']}
+• **처리 중인 호출**: {execution['in_flight']}개
+• **누적 호출 / 오류 / 시간 초과**: {execution['calls']} / {execution['errors']} / {execution['timeouts']}
+• **시간 초과 후에도 계속 실행된 호출**: {execution['abandoned']}개 (끝날 때까지 처리 중인 호출에 포함)
+"""
+
+        report += f"""
+**조회 시점**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+"""
+        return report
+
+    except Exception as e:
+        return f"❌ 메모리 진단 중 오류 발생: {str(e)}"
+
+
 @mcp.tool()
 def get_cloud_custodian_aws_resource_reference_html(resource_name: str) -> str:
     """
@@ -660,10 +1011,15 @@ if __name__ == "__main__":
     print(f"📝 IaC YAML 출력 폴더: {IAC_OUTPUT_DIR}")
     args = parse_args()
     if not args.no_mcp_run:
-        print("🚀 MCP 서버 실행 중...")
-        mcp.run()
+        print(f"🚀 MCP 서버 실행 중... (transport: {args.transport})")
+        run_server(mcp, args)
     else:
         print("🔧 MCP 서버 실행을 건너뜁니다. (디버깅 모드)")
-        with open(get_latest_file()[0], "r", encoding="utf-8") as f:
-            pass
+        latest_file, error = get_latest_file()
+        if error:
+            print(f"❌ {error}")
+        else:
+            # BOM / cp949 / UTF-16 리포트도 인코딩을 판별해서 앞부분만 디코딩
+            with open_report(latest_file) as report:
+                print(f"📄 {latest_file.name} ({report.encoding}):\n{report.preview(500)}")
             # print(get_prowler_reports_list())
\ No newline at end of file
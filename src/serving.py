@@ -0,0 +1,167 @@
+"""
+HTTP / SSE 전송 모드에서 여러 어시스턴트 세션을 동시에 처리하기 위한 설정
+
+FastMCP 는 동기 tool 함수를 이벤트 루프 안에서 그대로 실행하므로, 파일 분석처럼
+오래 걸리는 호출 하나가 다른 세션의 요청까지 막습니다. ToolExecutionMiddleware 는
+동기 tool 함수 본문만 워커 스레드 풀에서 실행하고(미들웨어 체인, Context, 세션 스트림은
+서버 이벤트 루프에 그대로 둠), 동시에 실행되는 호출 수와 호출별 시간을 제한합니다.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import Middleware
+from fastmcp.tools.tool import FunctionTool
+
+TRANSPORTS = ("stdio", "http", "sse")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_REQUEST_TIMEOUT = 120.0
+
+# HTTP/SSE 모드에서 사용 중인 미들웨어 (진단 tool 에서 조회, stdio 모드에서는 None)
+active_middleware = None
+
+
+class ToolExecutionMiddleware(Middleware):
+    """동기 tool 을 워커 스레드에서 실행하고 동시 실행 수와 실행 시간을 제한"""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 request_timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        """
+        :param workers: tool 을 실행할 워커 스레드 수
+        :param max_concurrency: 동시에 처리 중일 수 있는 tool 호출 수 (초과분은 대기)
+        :param request_timeout: 대기 시간을 포함한 호출당 최대 시간 (초, 0 이하이면 무제한)
+            시간이 지나면 오류 응답만 먼저 보내고 실행 중인 작업은 중단하지 않습니다.
+            그 작업의 워커와 동시 실행 슬롯은 작업이 실제로 끝날 때 반환됩니다.
+        """
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout if request_timeout and request_timeout > 0 else None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prowler-tool")
+        self._semaphore = None
+        self._stats_lock = threading.Lock()
+        self.stats = {"calls": 0, "in_flight": 0, "timeouts": 0, "abandoned": 0, "errors": 0}
+
+    def install(self, tools):
+        """
+        동기 tool 함수를 워커 스레드에서 실행하는 async 함수로 교체
+        :param tools: FastMCP.get_tools() 결과 (async tool 은 서버 이벤트 루프에서 그대로 실행)
+        """
+        for tool in tools.values():
+            if isinstance(tool, FunctionTool) and not inspect.iscoroutinefunction(tool.fn):
+                tool.fn = self.offload(tool.fn)
+
+    def offload(self, fn):
+        """fn 을 워커 스레드에서 실행하는 async 함수 (시그니처는 그대로 유지해서 인자 검증에 사용)"""
+
+        @functools.wraps(fn)
+        async def run_in_worker(*args, **kwargs):
+            # 세마포어는 서버 이벤트 루프 안에서 생성
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            loop = asyncio.get_running_loop()
+            await self._semaphore.acquire()
+            self._count("calls")
+            self._count("in_flight")
+            future = self._executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+            # 세마포어와 in_flight 는 응답 시점이 아니라 워커에서 실제로 끝났을 때 반환
+            future.add_done_callback(lambda f: self._on_done(loop, f))
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # 아직 워커에 배정되지 않은 호출만 취소됨 (실행 중인 스레드는 멈출 수 없음)
+                if not future.cancel():
+                    self._count("abandoned")
+                raise
+
+        return run_in_worker
+
+    async def on_call_tool(self, context, call_next):
+        try:
+            return await asyncio.wait_for(call_next(context), self.request_timeout)
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            raise ToolError(
+                f"'{context.message.name}' 호출이 제한 시간 {self.request_timeout:g}초를 초과했습니다. "
+                f"(이미 실행 중인 작업은 끝날 때까지 워커를 사용합니다)"
+            )
+
+    def _on_done(self, loop, future):
+        """워커 스레드(또는 취소한 스레드)에서 호출됨"""
+        if not future.cancelled() and future.exception() is not None:
+            self._count("errors")
+        self._count("in_flight", -1)
+        try:
+            loop.call_soon_threadsafe(self._semaphore.release)
+        except RuntimeError:
+            # 서버 종료로 이벤트 루프가 닫힌 경우
+            pass
+
+    def _count(self, key: str, delta: int = 1):
+        with self._stats_lock:
+            self.stats[key] += delta
+
+    def snapshot(self) -> dict:
+        with self._stats_lock:
+            return dict(self.stats, workers=self.workers,
+                        max_concurrency=self.max_concurrency,
+                        request_timeout=self.request_timeout,
+                        sampled_at=time.time())
+
+
+def add_transport_arguments(parser):
+    """parse_args 에 전송 모드 관련 옵션 추가"""
+    group = parser.add_argument_group("전송 모드 (HTTP/SSE 공유 인스턴스)")
+    group.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default="stdio",
+        help="MCP 전송 방식 (기본값: stdio, 공유 인스턴스는 http 또는 sse)",
+    )
+    group.add_argument("--host", type=str, default=DEFAULT_HOST,
+                       help=f"HTTP/SSE 바인드 주소 (기본값: {DEFAULT_HOST})")
+    group.add_argument("--port", type=int, default=DEFAULT_PORT,
+                       help=f"HTTP/SSE 포트 (기본값: {DEFAULT_PORT})")
+    group.add_argument("--path", type=str, default=None,
+                       help="엔드포인트 경로 (기본값: http 는 /mcp/, sse 는 /sse/)")
+    group.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                       help=f"tool 을 실행할 워커 스레드 수 (기본값: {DEFAULT_WORKERS})")
+    group.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                       help=f"동시에 처리할 tool 호출 수, 초과분은 대기 (기본값: {DEFAULT_MAX_CONCURRENCY})")
+    group.add_argument("--request-timeout", type=float, default=DEFAULT_REQUEST_TIMEOUT,
+                       help=f"tool 호출당 제한 시간(초), 0 이면 무제한. 시간 초과 시 응답만 포기하고 "
+                            f"실행 중인 작업은 끝날 때까지 워커를 사용 (기본값: {DEFAULT_REQUEST_TIMEOUT:g})")
+    return group
+
+
+def run_server(mcp, args):
+    """선택한 전송 방식으로 MCP 서버 실행"""
+    global active_middleware
+    if args.transport == "stdio":
+        mcp.run()
+        return
+
+    middleware = ToolExecutionMiddleware(
+        workers=args.workers,
+        max_concurrency=args.max_concurrency,
+        request_timeout=args.request_timeout,
+    )
+    middleware.install(asyncio.run(mcp.get_tools()))
+    mcp.add_middleware(middleware)
+    active_middleware = middleware
+    mcp.run(
+        transport=args.transport,
+        host=args.host,
+        port=args.port,
+        path=args.path,
+    )
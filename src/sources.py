@@ -0,0 +1,185 @@
+"""
+여러 리포트 루트 디렉토리(사업부별 마운트 등)를 동시에 스캔하는 모듈
+
+루트마다 하위 폴더까지 재귀적으로 찾아 내려가며, 디렉토리 하나를 스레드 풀 작업 하나로
+처리해서 여러 루트와 하위 폴더의 scandir / stat I/O 가 서로 겹치도록 합니다.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+DEFAULT_SCAN_WORKERS = 8
+
+SKIP_FILES = {".DS_Store", "Thumbs.db", "desktop.ini"}
+
+
+class ReportRoot:
+    """이름이 붙은 리포트 루트 디렉토리"""
+
+    def __init__(self, name: str, path, recursive: bool = True):
+        self.name = name
+        self.path = Path(path)
+        self.recursive = recursive
+
+    def __repr__(self):
+        return f"ReportRoot({self.name!r}, {str(self.path)!r})"
+
+
+class ReportEntry:
+    """스캔으로 찾은 리포트 파일 하나"""
+
+    __slots__ = ("root", "path", "size", "mtime")
+
+    def __init__(self, root: str, path: Path, size: int, mtime: float):
+        self.root = root
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+
+class RootScanStats:
+    """루트 하나의 스캔 결과 통계"""
+
+    def __init__(self, root: ReportRoot):
+        self.root = root
+        self.files = 0
+        self.directories = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+
+class ScanResult:
+    def __init__(self, entries: list, stats: dict, elapsed: float):
+        self.entries = entries
+        self.stats = stats
+        self.elapsed = elapsed
+
+    def latest(self):
+        """가장 최근에 수정된 리포트 (없으면 None)"""
+        return max(self.entries, key=lambda e: e.mtime, default=None)
+
+
+def parse_root_spec(spec: str) -> ReportRoot:
+    """
+    '--report-root' 값 파싱
+    :param spec: 'NAME=PATH' 또는 'PATH' (이름을 생략하면 디렉토리 이름 사용)
+    """
+    name, sep, path = spec.partition("=")
+    if not sep or not name.strip() or os.path.isdir(spec):
+        path = spec
+        name = Path(spec).name or spec
+    return ReportRoot(name.strip(), Path(path.strip()).expanduser())
+
+
+def _scan_directory(directory: Path, recursive: bool, skip_dirs=frozenset()):
+    """
+    디렉토리 하나의 파일(stat 포함)과 하위 디렉토리 목록
+    :param skip_dirs: 내려가지 않을 하위 디렉토리 (다른 루트로 등록된 경로)
+    """
+    files, subdirs = [], []
+    with os.scandir(directory) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and entry.path not in skip_dirs:
+                        subdirs.append(Path(entry.path))
+                elif entry.is_file() and entry.name not in SKIP_FILES:
+                    stat = entry.stat()
+                    files.append((Path(entry.path), stat.st_size, stat.st_mtime))
+            except OSError:
+                # 스캔 도중 삭제된 파일 등은 건너뜀
+                continue
+    return files, subdirs
+
+
+class ReportSources:
+    """여러 리포트 루트를 스레드 풀로 동시에 스캔"""
+
+    def __init__(self, roots=(), max_workers: int = DEFAULT_SCAN_WORKERS):
+        self.roots = list(roots)
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+
+    def configure(self, roots, max_workers: int = None):
+        """
+        parse_args 이후 루트 목록 교체
+        루트 경로는 절대 경로로 바꾸고, 이름이나 경로가 겹치면 ValueError 를 발생시킵니다.
+        """
+        by_name, by_path = {}, {}
+        for root in roots:
+            root = ReportRoot(root.name, root.path.resolve(), root.recursive)
+            if root.name in by_name:
+                raise ValueError(f"리포트 루트 이름이 중복됩니다: '{root.name}' "
+                                 f"({by_name[root.name].path}, {root.path}) - NAME=PATH 로 이름을 지정하세요")
+            if root.path in by_path:
+                raise ValueError(f"같은 경로가 여러 리포트 루트로 등록되었습니다: {root.path} "
+                                 f"('{by_path[root.path].name}', '{root.name}')")
+            by_name[root.name] = by_path[root.path] = root
+        with self._lock:
+            self.roots = list(by_name.values())
+            if max_workers:
+                self.max_workers = max_workers
+
+    def scan(self, suffixes=None) -> ScanResult:
+        """
+        모든 루트를 재귀적으로 스캔
+        :param suffixes: 포함할 확장자 집합 (소문자, 예: {'.csv', '.json'}), None 이면 전체
+        :return: ScanResult (파일 목록과 루트별 소요 시간)
+        """
+        with self._lock:
+            roots = list(self.roots)
+            max_workers = self.max_workers
+
+        started = time.perf_counter()
+        stats = {root.name: RootScanStats(root) for root in roots}
+        entries = []
+        outstanding = {}
+        pending = {}
+        # 다른 루트 안에 들어 있는 루트는 그 루트에서만 스캔 (같은 파일이 두 번 집계되지 않도록)
+        root_dirs = frozenset(str(root.path) for root in roots)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-scan") as executor:
+            for root in roots:
+                if not root.path.is_dir():
+                    stats[root.name].errors.append(f"디렉토리가 존재하지 않습니다: {root.path}")
+                    continue
+                future = executor.submit(_scan_directory, root.path, root.recursive, root_dirs)
+                pending[future] = (root, root.path)
+                outstanding[root.name] = 1
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    root, directory = pending.pop(future)
+                    root_stats = stats[root.name]
+                    root_stats.directories += 1
+                    try:
+                        files, subdirs = future.result()
+                    except OSError as e:
+                        root_stats.errors.append(f"{directory}: {e}")
+                        files, subdirs = [], []
+
+                    for path, size, mtime in files:
+                        if suffixes is None or path.suffix.lower() in suffixes:
+                            entries.append(ReportEntry(root.name, path, size, mtime))
+                            root_stats.files += 1
+                    for subdir in subdirs:
+                        pending[executor.submit(_scan_directory, subdir, True, root_dirs)] = (root, subdir)
+
+                    outstanding[root.name] += len(subdirs) - 1
+                    if outstanding[root.name] == 0:
+                        root_stats.elapsed = time.perf_counter() - root_stats.started
+
+        return ScanResult(entries, stats, time.perf_counter() - started)
@@ -0,0 +1,172 @@
+import codecs
+import csv
+import io
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from aggregate import OTHER_GROUP, CountMinSketch, FindingAggregator, HeavyHitters, SpaceSaving
+from parser import finding_dimensions
+
+
+def _zipf_stream(n_items=500, length=20000, seed=7):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** 1.2 for rank in range(n_items)]
+    return rng.choices([f"check_{i}" for i in range(n_items)], weights=weights, k=length)
+
+
+def test_space_saving_error_bound_and_top_k():
+    stream = _zipf_stream()
+    exact = Counter(stream)
+    sketch = SpaceSaving(capacity=80)
+    for item in stream:
+        sketch.add(item)
+
+    for item, estimate, error in sketch.top(80):
+        # 추정값은 실제값 이상이고, 최대 오차 안에 있으며, 오차는 N / capacity 이하
+        assert exact[item] <= estimate <= exact[item] + error
+        assert error <= len(stream) / 80
+    assert [item for item, _, _ in sketch.top(10)] == [item for item, _ in exact.most_common(10)]
+
+
+def test_count_min_sketch_never_underestimates():
+    stream = _zipf_stream(n_items=3000, length=10000)
+    exact = Counter(stream)
+    sketch = CountMinSketch(width=256, depth=4)
+    for item in stream:
+        sketch.add(item)
+    assert all(sketch.estimate(item) >= count for item, count in exact.items())
+
+
+def test_heavy_hitters_top_k_matches_exact():
+    stream = _zipf_stream()
+    exact = Counter(stream)
+    hitters = HeavyHitters(capacity=80)
+    for item in stream:
+        hitters.add(item)
+    assert [item for item, _ in hitters.top(10)] == [item for item, _ in exact.most_common(10)]
+
+
+ASFF = {
+    "AwsAccountId": "111111111111",
+    "GeneratorId": "prowler-s3_bucket_public_access",
+    "ProductFields": {"ServiceName": "s3"},
+    "Resources": [{"Region": "ap-northeast-2"}],
+    "Compliance": {"Status": "FAILED"},
+    "Severity": {"Label": "HIGH"},
+}
+
+OCSF = {
+    "metadata": {"event_code": "iam_root_mfa_enabled"},
+    "cloud": {"account": {"uid": "222222222222"}, "region": "us-east-1"},
+    "resources": [{"group": {"name": "iam"}}],
+    "status_code": "PASS",
+    "severity": "Critical",
+}
+
+
+@pytest.mark.parametrize("finding, expected", [
+    (ASFF, {"account": "111111111111", "region": "ap-northeast-2", "service": "s3",
+            "check": "s3_bucket_public_access", "severity": "HIGH", "status": "FAIL"}),
+    (OCSF, {"account": "222222222222", "region": "us-east-1", "service": "iam",
+            "check": "iam_root_mfa_enabled", "severity": "CRITICAL", "status": "PASS"}),
+    # Prowler v3 CSV
+    ({"ACCOUNT_ID": "333", "REGION": "eu-west-1", "CHECK_ID": "ec2_ebs_encryption",
+      "STATUS": "FAIL", "SEVERITY": "medium"},
+     {"account": "333", "region": "eu-west-1", "service": "ec2",
+      "check": "ec2_ebs_encryption", "severity": "MEDIUM", "status": "FAIL"}),
+    # Prowler v4 CSV
+    ({"ACCOUNT_UID": "444", "REGION": "us-west-2", "CHECK_ID": "rds_instance_backup",
+      "SERVICE_NAME": "rds", "STATUS": "PASS", "SEVERITY": "low"},
+     {"account": "444", "region": "us-west-2", "service": "rds",
+      "check": "rds_instance_backup", "severity": "LOW", "status": "PASS"}),
+])
+def test_finding_dimensions_per_format(finding, expected):
+    assert finding_dimensions(finding) == expected
+
+
+def _csv(rows):
+    out = io.StringIO()
+    writer = csv.writer(out, delimiter=";", lineterminator="\n")
+    writer.writerow(["ACCOUNT_UID", "REGION", "CHECK_ID", "STATUS", "SEVERITY"])
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def test_multi_key_group_by_with_pass_rate(tmp_path):
+    report = tmp_path / "scan.csv"
+    report.write_text(_csv([
+        ("a1", "r1", "s3_x", "PASS", "low"),
+        ("a1", "r1", "s3_x", "FAIL", "high"),
+        ("a1", "r1", "iam_y", "FAIL", "critical"),
+        ("a1", "r2", "s3_x", "PASS", "low"),
+        ("a2", "r1", "s3_x", "FAIL", "high"),
+    ]), encoding="utf-8")
+
+    aggregator = FindingAggregator(["account", "region"], top_n=5)
+    aggregator.add_report(report)
+    groups = dict(aggregator.ranked_groups())
+
+    assert list(groups) == [("a1", "r1"), ("a2", "r1"), ("a1", "r2")]
+    assert groups[("a1", "r1")].pass_rate == pytest.approx(100 / 3)
+    assert groups[("a1", "r1")].severity_fail == {"HIGH": 1, "CRITICAL": 1}
+    assert groups[("a1", "r2")].pass_rate == 100.0
+    assert aggregator.totals().failed == 3
+    assert aggregator.global_failing.top(1) == [("s3_x", 2)]
+    assert not aggregator.partial_reports
+
+
+def test_report_dimension_uses_given_label(tmp_path):
+    for folder in ("day1", "day2"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "scan.csv").write_text(_csv([("a", "r", "c", "FAIL", "low")]), encoding="utf-8")
+
+    aggregator = FindingAggregator(["report"])
+    aggregator.add_report(tmp_path / "day1" / "scan.csv", "bu1:day1/scan.csv")
+    aggregator.add_report(tmp_path / "day2" / "scan.csv", "bu1:day2/scan.csv")
+    assert set(aggregator.groups) == {("bu1:day1/scan.csv",), ("bu1:day2/scan.csv",)}
+
+
+def test_malformed_and_truncated_records_mark_report_partial(tmp_path):
+    findings = [json.dumps(ASFF)] * 5
+    findings[1] = '{"Compliance": bad}'
+    malformed = tmp_path / "malformed.asff.json"
+    malformed.write_text("[" + ",".join(findings) + "]", encoding="utf-8")
+    truncated = tmp_path / "truncated.asff.json"
+    truncated.write_text("[" + json.dumps(ASFF) + "," + json.dumps(ASFF)[:-10], encoding="utf-8")
+
+    aggregator = FindingAggregator(["account"])
+    aggregator.add_report(malformed, "malformed")
+    status = aggregator.add_report(truncated, "truncated")
+
+    assert aggregator.findings == 5
+    assert aggregator.parse_errors == 2
+    assert status["pending_bytes"] == 0
+    assert [label for label, _ in aggregator.partial_reports] == ["malformed", "truncated"]
+
+
+def test_utf16_report_and_missing_trailing_newline(tmp_path):
+    text = _csv([("a", "r", "c1", "FAIL", "high"), ("a", "r", "c2", "PASS", "low")]).rstrip("\n")
+    report = tmp_path / "scan.csv"
+    report.write_bytes(codecs.BOM_UTF16_LE + text.encode("utf-16-le"))
+
+    aggregator = FindingAggregator(["account"])
+    aggregator.add_report(report)
+    assert aggregator.findings == 2
+    assert aggregator.parse_errors == 0
+    assert aggregator.groups[("a",)].failed == 1
+
+
+def test_group_count_is_capped(tmp_path):
+    rows = [(f"acct{i}", "r", "c", "FAIL", "low") for i in range(10)]
+    report = tmp_path / "scan.csv"
+    report.write_text(_csv(rows), encoding="utf-8")
+
+    aggregator = FindingAggregator(["account"], max_tracked_groups=3)
+    aggregator.add_report(report)
+    assert len(aggregator.groups) == 4
+    assert aggregator.groups[(OTHER_GROUP,)].total == 7
+    assert aggregator.other_findings == 7
+    assert aggregator.totals().total == 10
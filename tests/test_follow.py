@@ -0,0 +1,161 @@
+import codecs
+import json
+
+from follow import ReportFollower, ReportFollowRegistry
+
+
+def _asff(status="PASSED", severity="LOW"):
+    return {"Compliance": {"Status": status}, "Severity": {"Label": severity}}
+
+
+def test_csv_follow_reads_only_completed_rows(tmp_path):
+    report = tmp_path / "scan.csv"
+    report.write_bytes(b"STATUS;SEVERITY;CHECK_ID\nPASS;low;a\nFAIL;high;b")
+    follower = ReportFollower(report)
+
+    status = follower.poll()
+    assert status["total_records"] == 1
+    assert status["pending_bytes"] == len(b"FAIL;high;b")
+
+    with open(report, "ab") as f:
+        f.write(b'\nFAIL;critical;"c\nd"\n')
+    status = follower.poll()
+    assert status["new_records"] == 2
+    assert status["pending_bytes"] == 0
+    assert status["keyword_counts"]["FAIL"] == 2
+    assert status["keyword_counts"]["CRITICAL"] == 1
+
+
+def test_json_array_truncated_record_waits_for_next_poll(tmp_path):
+    report = tmp_path / "scan.asff.json"
+    body = json.dumps([_asff(), _asff("FAILED", "HIGH")])
+    report.write_text(body[:-20], encoding="utf-8")
+    follower = ReportFollower(report)
+
+    status = follower.poll()
+    assert status["total_records"] == 1
+    assert status["parse_errors"] == 0
+    assert status["pending_bytes"] > 0
+    assert not status["complete"]
+
+    report.write_text(body, encoding="utf-8")
+    status = follower.poll()
+    assert status["total_records"] == 2
+    assert status["parse_errors"] == 0
+    assert status["pending_bytes"] == 0
+    assert status["complete"]
+
+
+def test_json_array_malformed_record_is_counted_and_skipped(tmp_path):
+    report = tmp_path / "scan.asff.json"
+    elements = [json.dumps(_asff("FAILED", "HIGH")) for _ in range(1002)]
+    elements[1] = '{"Compliance": bad, "Note": "a, b ] }"}'
+    report.write_text("[\n" + ",\n".join(elements) + "\n]", encoding="utf-8")
+
+    status = ReportFollower(report).poll()
+    assert status["total_records"] == 1001
+    assert status["parse_errors"] == 1
+    assert status["pending_bytes"] == 0
+    assert status["complete"]
+    assert status["keyword_counts"]["FAIL"] == 1001
+
+
+def test_json_lines_malformed_line_is_counted_and_skipped(tmp_path):
+    report = tmp_path / "scan.json"
+    report.write_text(
+        json.dumps(_asff()) + "\n{not json}\n" + json.dumps(_asff("FAILED")) + "\n",
+        encoding="utf-8",
+    )
+
+    status = ReportFollower(report).poll()
+    assert status["format"] == "json-lines"
+    assert status["total_records"] == 2
+    assert status["parse_errors"] == 1
+    assert status["pending_bytes"] == 0
+
+
+def test_truncated_file_restarts_from_beginning(tmp_path):
+    report = tmp_path / "scan.csv"
+    report.write_bytes(b"STATUS,SEVERITY\nPASS,low\nPASS,low\n")
+    follower = ReportFollower(report)
+    assert follower.poll()["total_records"] == 2
+
+    report.write_bytes(b"STATUS,SEVERITY\nFAIL,high\n")
+    status = follower.poll()
+    assert status["total_records"] == 1
+    assert status["keyword_counts"]["FAIL"] == 1
+
+
+def test_registry_keeps_offsets_per_path(tmp_path):
+    report = tmp_path / "scan.csv"
+    report.write_bytes(b"STATUS,SEVERITY\nPASS,low\n")
+    registry = ReportFollowRegistry()
+
+    assert registry.poll(report)["new_records"] == 1
+    assert registry.poll(str(report))["new_records"] == 0
+    assert registry.poll(report, reset=True)["new_records"] == 1
+    assert registry.approximate_bytes() > 0
+
+
+def test_utf16_csv_follow(tmp_path):
+    report = tmp_path / "scan.csv"
+    text = "STATUS,SEVERITY,CHECK_ID\nPASS,low,a\nFAIL,high,b\n"
+    report.write_bytes(codecs.BOM_UTF16_LE + text.encode("utf-16-le")[:-1])
+    follower = ReportFollower(report)
+
+    status = follower.poll()
+    assert follower.header == ["STATUS", "SEVERITY", "CHECK_ID"]
+    assert status["encoding"] == "utf-16-le"
+    assert status["total_records"] == 1
+    assert status["pending_bytes"] == len("FAIL,high,b\n".encode("utf-16-le")) - 1
+
+    report.write_bytes(codecs.BOM_UTF16_LE + text.encode("utf-16-le"))
+    status = follower.poll()
+    assert status["total_records"] == 2
+    assert status["pending_bytes"] == 0
+    assert status["keyword_counts"]["FAIL"] == 1
+    assert status["keyword_counts"]["HIGH"] == 1
+
+
+def test_utf16_json_array_follow(tmp_path):
+    report = tmp_path / "scan.asff.json"
+    body = json.dumps([_asff("FAILED", "CRITICAL"), {"Compliance": {"Status": "PASSED"}, "Title": "한글"}],
+                      ensure_ascii=False)
+    report.write_bytes(codecs.BOM_UTF16_BE + body.encode("utf-16-be"))
+
+    status = ReportFollower(report).poll()
+    assert status["format"] == "json-array"
+    assert status["total_records"] == 2
+    assert status["pending_bytes"] == 0
+    assert status["complete"]
+
+
+def test_unknown_format_is_not_buffered(tmp_path):
+    report = tmp_path / "scan.json"
+    report.write_bytes(b"<html>" + b"x" * 100)
+    follower = ReportFollower(report)
+
+    status = follower.poll()
+    assert status["format"] == "unknown"
+    assert status["offset"] == 0
+    assert follower.poll()["bytes_read"] == 0
+
+
+def test_bytes_appended_during_poll_are_left_for_next_poll(tmp_path):
+    report = tmp_path / "scan.csv"
+    report.write_bytes(b"STATUS,SEVERITY\nPASS,low\n")
+
+    def append_once(finding):
+        if follower.record_count == 0:
+            with open(report, "ab") as f:
+                f.write(b"FAIL,high\n" * 5)
+
+    follower = ReportFollower(report, on_finding=append_once)
+    status = follower.poll()
+    assert status["total_records"] == 1
+    assert status["offset"] == status["file_size"]
+    assert status["pending_bytes"] == 0
+
+    status = follower.poll()
+    assert status["new_records"] == 5
+    assert status["pending_bytes"] == 0
@@ -0,0 +1,73 @@
+import codecs
+
+import pytest
+
+from ingest import detect_encoding, open_report
+
+
+@pytest.mark.parametrize("head, expected", [
+    (codecs.BOM_UTF8 + b"STATUS", ("utf-8", 3)),
+    (codecs.BOM_UTF16_LE + "STATUS".encode("utf-16-le"), ("utf-16-le", 2)),
+    (codecs.BOM_UTF32_LE + "STATUS".encode("utf-32-le"), ("utf-32-le", 4)),
+    ("상태,심각도".encode("utf-8"), ("utf-8", 0)),
+    ("상태,심각도".encode("cp949"), ("cp949", 0)),
+])
+def test_detect_encoding(head, expected):
+    assert detect_encoding(head) == expected
+
+
+def test_detect_encoding_ignores_multibyte_char_cut_at_block_end():
+    head = "상태".encode("utf-8")[:-1]
+    assert detect_encoding(head) == ("utf-8", 0)
+
+
+def test_count_lines_skip_blank_matches_non_empty_lines(tmp_path):
+    report = tmp_path / "r.csv"
+    report.write_bytes(b"H\nr1\n  \r\nr2\n\n\n")
+    with open_report(report) as buffer:
+        assert buffer.count_lines() == 6
+        assert buffer.count_lines(skip_blank=True) == 3
+
+
+@pytest.mark.parametrize("encoding, bom", [
+    ("utf-8", codecs.BOM_UTF8),
+    ("cp949", b""),
+    ("utf-16-le", codecs.BOM_UTF16_LE),
+])
+def test_csv_lines_and_keywords_per_encoding(tmp_path, encoding, bom):
+    text = "STATUS,SEVERITY,설명\nPASS,low,통과\n\nFAIL,critical,실패\nFAIL,high,실패\n"
+    report = tmp_path / "r.csv"
+    report.write_bytes(bom + text.encode(encoding))
+    with open_report(report) as buffer:
+        assert buffer.encoding == encoding
+        assert buffer.count_lines(skip_blank=True) == 4
+        assert list(buffer.iter_lines(limit=2)) == ["STATUS,SEVERITY,설명", "PASS,low,통과"]
+        assert buffer.count_keywords(["PASS", "FAIL", "CRITICAL"]) == {"PASS": 1, "FAIL": 2, "CRITICAL": 1}
+
+
+def test_cp949_trail_bytes_are_not_counted_as_tokens(tmp_path):
+    # '괏' 의 cp949 두 번째 바이트는 ASCII 'A' 와 같음
+    report = tmp_path / "r.csv"
+    report.write_bytes("괏LOW LOW".encode("cp949"))
+    with open_report(report) as buffer:
+        assert not buffer.byte_searchable
+        assert buffer.count_keywords(["LOW"]) == {"LOW": 1}
+
+
+def test_preview_and_decode_drop_cut_characters(tmp_path):
+    report = tmp_path / "r.txt"
+    report.write_bytes(codecs.BOM_UTF8 + "가나다라".encode("utf-8"))
+    with open_report(report) as buffer:
+        assert buffer.body_length == 12
+        assert buffer.decode(0, 4) == "가"
+        assert buffer.preview(2) == "가나"
+        assert buffer.text() == "가나다라"
+
+
+def test_empty_file(tmp_path):
+    report = tmp_path / "empty.csv"
+    report.write_bytes(b"")
+    with open_report(report) as buffer:
+        assert buffer.count_lines() == 0
+        assert list(buffer.iter_lines()) == []
+        assert buffer.count_keywords(["PASS"]) == {"PASS": 0}
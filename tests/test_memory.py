@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+
+import memory
+from memory import MemoryGovernor, estimate_size
+
+
+def _governor(tmp_path, budget=1000, **kwargs):
+    return MemoryGovernor(budget, spill_dir=tmp_path / "spill", **kwargs)
+
+
+def test_get_or_build_caches_until_budget(tmp_path):
+    governor = _governor(tmp_path)
+    store = governor.store("analysis")
+    calls = []
+
+    def build():
+        calls.append(1)
+        return "x" * 100
+
+    assert store.get_or_build("a", build) == "x" * 100
+    assert store.get_or_build("a", build) == "x" * 100
+    assert len(calls) == 1
+    assert store.counters["hits"] == 1
+
+
+def test_eviction_spills_and_reloads_without_rebuilding(tmp_path):
+    governor = _governor(tmp_path, budget=400)
+    store = governor.store("analysis")
+    size_of = lambda value: 150
+
+    for key in "abc":
+        store.get_or_build(key, lambda key=key: {"key": key}, size_of=size_of)
+    assert len(store._entries) == 2
+    assert len(store._spilled) == 1
+    assert store.counters["spills"] == 1
+
+    # spill 된 항목은 build 없이 디스크에서 읽어 옴
+    evicted = next(iter(store._spilled))
+    value = store.get_or_build(evicted, lambda: pytest.fail("rebuilt"), size_of=size_of)
+    assert value == {"key": evicted}
+    assert store.counters["spill_hits"] == 1
+
+
+def test_expensive_entries_survive_eviction(tmp_path):
+    governor = _governor(tmp_path, budget=300)
+    store = governor.store("analysis", spill=False)
+    governor.store("summary", spill=False)
+
+    store._admit("expensive", "e", 100, cost=10.0)
+    store._admit("cheap", "c", 100, cost=0.001)
+    store._admit("new", "n", 150, cost=1.0)
+    assert set(store._entries) == {"expensive", "new"}
+
+
+def test_values_larger_than_budget_are_not_cached(tmp_path):
+    governor = _governor(tmp_path, budget=100)
+    store = governor.store("analysis")
+    store.get_or_build("big", lambda: "x", size_of=lambda value: 101)
+    assert store.counters["rejected"] == 1
+    assert not store._entries
+
+
+def test_rss_pressure_evicts_to_target_instead_of_everything(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory, "current_rss", lambda: 10 ** 12)
+    governor = _governor(tmp_path, budget=10 * 1024 * 1024, rss_limit_bytes=1)
+    store = governor.store("analysis", spill=False)
+
+    for key in range(10):
+        store._admit(key, key, 1000, cost=1.0)
+    assert governor.counters["rss_pressure_events"] == 1
+    # 첫 항목은 한 번의 RSS 압박으로 내보내고, 이후 삽입은 재확인 간격 안이라 유지
+    assert len(store._entries) == 9
+
+    governor._next_rss_check = 0.0
+    store._admit("one-more", 0, 1000, cost=1.0)
+    assert governor.counters["rss_pressure_events"] == 2
+    assert len(store._entries) == 8
+
+
+def test_reserve_is_advisory(tmp_path):
+    governor = _governor(tmp_path, budget=1000)
+    store = governor.store("analysis", spill=False)
+    store._admit("a", "a", 500, cost=1.0)
+
+    with governor.reserve("parse_buffers", 5000) as fits:
+        assert not fits
+        assert not store._entries
+        assert governor.snapshot()["reserved_bytes"]["parse_buffers"] == 5000
+    assert governor.snapshot()["reserved_bytes"]["parse_buffers"] == 0
+    assert governor.counters["oversized_reservations"] == 1
+
+    with governor.reserve("parse_buffers", 100) as fits:
+        assert fits
+
+
+def test_spill_write_does_not_hold_governor_lock(tmp_path, monkeypatch):
+    governor = _governor(tmp_path, budget=100)
+    store = governor.store("analysis")
+    lock_free = []
+    real_dump = memory.pickle.dump
+
+    def checking_dump(value, f, protocol):
+        # 다른 스레드에서 lock 을 바로 잡았다가 놓을 수 있어야 함
+        result = []
+        t = threading.Thread(target=lambda: result.append(
+            governor.lock.acquire(timeout=1) and (governor.lock.release() or True)))
+        t.start()
+        t.join()
+        lock_free.append(result[0])
+        real_dump(value, f, protocol=protocol)
+
+    monkeypatch.setattr(memory.pickle, "dump", checking_dump)
+    store._admit("a", "a", 60, cost=1.0)
+    store._admit("b", "b", 60, cost=1.0)
+    assert lock_free == [True]
+    assert len(store._spilled) == 1
+
+
+def test_spill_directory_is_trimmed(tmp_path):
+    governor = _governor(tmp_path, budget=100)
+    store = governor.store("analysis")
+    for key in range(50):
+        store._admit(key, "x" * 200, 60, cost=1.0)
+    assert store.spilled_bytes <= governor.budget_bytes * memory.SPILL_LIMIT_RATIO
+    assert store.counters["spill_drops"] > 0
+    assert len(list((tmp_path / "spill").glob("*.pkl"))) == len(store._spilled)
+
+
+def test_external_sizes_are_accounted(tmp_path):
+    governor = _governor(tmp_path)
+    governor.register_external("follow", lambda: 123)
+    assert governor.accounted_bytes() == 123
+    assert estimate_size({"a": [1, 2]}) > estimate_size({})
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+try:
+    from fastmcp import Client, Context, FastMCP
+    from fastmcp.exceptions import ToolError
+
+    from serving import ToolExecutionMiddleware
+except Exception as e:  # fastmcp 를 import 할 수 없는 환경
+    pytest.skip(f"fastmcp 를 사용할 수 없음: {e}", allow_module_level=True)
+
+
+def _server(**kwargs):
+    mcp = FastMCP("test")
+    release = threading.Event()
+
+    @mcp.tool()
+    def slow(seconds: float) -> str:
+        release.wait(seconds)
+        return threading.current_thread().name
+
+    @mcp.tool()
+    def fast() -> str:
+        return threading.current_thread().name
+
+    @mcp.tool()
+    async def with_context(ctx: Context) -> str:
+        await ctx.info("running on the server loop")
+        return threading.current_thread().name
+
+    middleware = ToolExecutionMiddleware(**kwargs)
+    middleware.install(asyncio.run(mcp.get_tools()))
+    mcp.add_middleware(middleware)
+    return mcp, middleware, release
+
+
+async def _text(client, name, arguments=None):
+    result = await client.call_tool(name, arguments or {})
+    return result.content[0].text
+
+
+def test_sync_tools_run_on_workers_and_async_tools_on_server_loop():
+    mcp, middleware, _ = _server(workers=2)
+
+    async def scenario():
+        async with Client(mcp) as client:
+            return await _text(client, "fast"), await _text(client, "with_context")
+
+    worker, server = asyncio.run(scenario())
+    assert worker.startswith("prowler-tool")
+    assert not server.startswith("prowler-tool")
+    assert middleware.snapshot()["calls"] == 1
+
+
+def test_timed_out_call_keeps_its_slot_until_the_worker_finishes():
+    mcp, middleware, release = _server(workers=1, max_concurrency=1, request_timeout=0.2)
+
+    async def scenario():
+        async with Client(mcp) as client:
+            with pytest.raises(ToolError):
+                await client.call_tool("slow", {"seconds": 5})
+            during = middleware.snapshot()
+            # 실행 중인 작업이 슬롯을 잡고 있으므로 다음 호출도 시간 초과
+            with pytest.raises(ToolError):
+                await client.call_tool("fast", {})
+            release.set()
+            for _ in range(50):
+                if middleware.snapshot()["in_flight"] == 0:
+                    break
+                await asyncio.sleep(0.02)
+            after = middleware.snapshot()
+            name = await _text(client, "fast")
+            return during, after, name
+
+    during, after, name = asyncio.run(scenario())
+    assert during["in_flight"] == 1
+    assert during["abandoned"] == 1
+    assert after["in_flight"] == 0
+    assert after["timeouts"] == 2
+    assert name.startswith("prowler-tool")
+    assert middleware._semaphore._value == 1
+
+
+def test_call_still_queued_at_timeout_is_cancelled():
+    mcp, middleware, release = _server(workers=1, max_concurrency=4, request_timeout=0.2)
+
+    async def scenario():
+        async with Client(mcp) as client:
+            results = await asyncio.gather(
+                client.call_tool("slow", {"seconds": 0.5}),
+                client.call_tool("fast", {}),
+                return_exceptions=True,
+            )
+            await asyncio.sleep(0.5)
+            return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, ToolError) for r in results)
+    stats = middleware.snapshot()
+    assert stats["abandoned"] == 1
+    assert stats["in_flight"] == 0
+    assert middleware._semaphore._value == 4
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from sources import ReportRoot, ReportSources, parse_root_spec
+
+
+def _touch(path, mtime=None, data=b"x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_parse_root_spec(tmp_path):
+    root = parse_root_spec(f"bu1={tmp_path}")
+    assert (root.name, root.path) == ("bu1", tmp_path)
+    root = parse_root_spec(str(tmp_path / "reports"))
+    assert (root.name, root.path) == ("reports", tmp_path / "reports")
+
+
+def test_scan_is_recursive_across_roots(tmp_path):
+    _touch(tmp_path / "a" / "r1.csv", mtime=100)
+    _touch(tmp_path / "a" / "2025" / "07" / "r2.json", mtime=300)
+    _touch(tmp_path / "a" / ".DS_Store")
+    _touch(tmp_path / "b" / "r3.html", mtime=200)
+    sources = ReportSources()
+    sources.configure([ReportRoot("a", tmp_path / "a"), ReportRoot("b", tmp_path / "b")], max_workers=2)
+
+    scan = sources.scan()
+    assert sorted((e.root, e.name) for e in scan.entries) == [("a", "r1.csv"), ("a", "r2.json"), ("b", "r3.html")]
+    assert scan.latest().name == "r2.json"
+    assert scan.stats["a"].directories == 3
+    assert scan.stats["a"].files == 2
+
+    scan = sources.scan({".csv", ".html"})
+    assert sorted(e.name for e in scan.entries) == ["r1.csv", "r3.html"]
+
+
+def test_nested_root_files_are_listed_once(tmp_path):
+    _touch(tmp_path / "out" / "top.csv")
+    _touch(tmp_path / "out" / "bu1" / "inner.csv")
+    sources = ReportSources()
+    sources.configure([ReportRoot("default", tmp_path / "out"), ReportRoot("bu1", tmp_path / "out" / "bu1")])
+
+    entries = sources.scan().entries
+    assert sorted((e.root, e.name) for e in entries) == [("bu1", "inner.csv"), ("default", "top.csv")]
+
+
+@pytest.mark.parametrize("second", [
+    lambda tmp: ReportRoot("reports", tmp / "bu2" / "reports"),
+    lambda tmp: ReportRoot("other", tmp / "bu1" / "reports"),
+])
+def test_duplicate_names_or_paths_are_rejected(tmp_path, second):
+    sources = ReportSources()
+    with pytest.raises(ValueError):
+        sources.configure([ReportRoot("reports", tmp_path / "bu1" / "reports"), second(tmp_path)])
+
+
+def test_missing_root_is_reported(tmp_path):
+    sources = ReportSources()
+    sources.configure([ReportRoot("gone", tmp_path / "missing")])
+    scan = sources.scan()
+    assert scan.entries == []
+    assert scan.latest() is None
+    assert scan.stats["gone"].errors